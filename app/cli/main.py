@@ -1,16 +1,44 @@
 import argparse
+import sys
 from app.core.engine import run_job_from_manifest
 from app.core.errors import UserFacingError
+from app.core.jobcache import JobCache
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--manifest", required=True)
+    ap.add_argument("--manifest")
+    ap.add_argument("--output", help="出力先（manifestのoutput_pdfより優先）。'-' で標準出力へ書き出す")
+    ap.add_argument("--no-cache", action="store_true", help="ジョブ出力キャッシュを使わない")
+    ap.add_argument("--clear-cache", action="store_true", help="ジョブ出力キャッシュを空にする（--manifest 無しならそれだけで終了）")
+    ap.add_argument("--cache-dir", help="キャッシュの保存先（既定: %%LOCALAPPDATA%%\\PDF2Booklet\\jobcache）")
+    ap.add_argument("--cache-max-mb", type=int, default=1024, help="キャッシュの上限サイズ(MB)")
     args = ap.parse_args()
+    if not args.manifest and not args.clear_cache:
+        ap.error("--manifest が必要です")
+
+    # --no-cache のときはキャッシュのフォルダに一切触れない
+    cache = None if args.no_cache and not args.clear_cache else JobCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+    if args.clear_cache:
+        try:
+            n = cache.clear()
+            print(f"キャッシュを削除しました: {n} 件", file=sys.stderr)
+        except OSError as e:
+            print(f"警告: キャッシュを削除できません: {e}", file=sys.stderr)
+        if not args.manifest:
+            return
+
+    to_stdout = args.output == "-"
+    output = sys.stdout.buffer if to_stdout else args.output
+    # PDFを標準出力へ流すときはステータスを標準エラーへ
+    status = sys.stderr if to_stdout else sys.stdout
     try:
-        run_job_from_manifest(args.manifest)
-        print("OK")
+        run_job_from_manifest(
+            args.manifest, output=output, cache=None if args.no_cache else cache,
+            log_cb=lambda msg: print(f"警告: {msg}", file=sys.stderr),
+        )
+        print("OK", file=status)
     except UserFacingError as e:
-        print(f"ERROR: {e}")
+        print(f"ERROR: {e}", file=status)
         raise SystemExit(2)
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Literal, Optional
+
+from .types import Item, Options, OutputTarget, OutputVariant
+from .docpool import DocumentPool
+from .engine import generate_pdf, generate_pdfs, load_manifest_outputs
+
+EventKind = Literal["progress", "log", "metric"]
+
+@dataclass
+class JobEvent:
+    kind: EventKind
+    # progress: (cur, total) / log: メッセージ / metric: 名前→値
+    current: int = 0
+    total: int = 0
+    message: str = ""
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+class AsyncJobRunner:
+    """asyncio から generate_pdf を使うためのラッパ。
+
+    重い処理は executor（既定はループのスレッドプール）で実行し、進捗・ログ・計測値を
+    非同期イテレータで流す。同時実行数は max_concurrency のセマフォで制限する。
+    イテレートしているタスクをキャンセルすると生成も中断される。
+    """
+
+    def __init__(self, max_concurrency: int = 2, executor: Optional[Executor] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.executor = executor
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        return self._sem
+
+    async def events(self, items: list[Item], options: Options, output_pdf: OutputTarget) -> AsyncIterator[JobEvent]:
+        async for ev in self._events(lambda **kw: generate_pdf(items, options, output_pdf, **kw)):
+            yield ev
+
+    async def events_variants(self, items: list[Item], variants: List[OutputVariant]) -> AsyncIterator[JobEvent]:
+        """generate_pdfs 版（複数出力を1回の描画で作る）"""
+        async for ev in self._events(lambda **kw: generate_pdfs(items, variants, **kw)):
+            yield ev
+
+    async def _events(self, job: Callable[..., None]) -> AsyncIterator[JobEvent]:
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue[Optional[JobEvent]] = asyncio.Queue()
+            cancel = threading.Event()
+            pool = DocumentPool()
+
+            def emit(ev: Optional[JobEvent]) -> None:
+                loop.call_soon_threadsafe(queue.put_nowait, ev)
+
+            def work() -> None:
+                try:
+                    job(
+                        progress_cb=lambda cur, total: emit(JobEvent("progress", current=cur, total=total)),
+                        cancel_cb=cancel.is_set,
+                        log_cb=lambda msg: emit(JobEvent("log", message=msg)),
+                        pool=pool,
+                    )
+                finally:
+                    pool.close()
+                    emit(None)
+
+            t0 = time.perf_counter()
+            fut = loop.run_in_executor(self.executor, work)
+            try:
+                while True:
+                    ev = await queue.get()
+                    if ev is None:
+                        break
+                    yield ev
+                await fut
+            except BaseException:
+                # タスクのキャンセル／途中で aclose された場合もワーカーを止めてから抜ける
+                cancel.set()
+                try:
+                    await asyncio.shield(fut)
+                except Exception:
+                    pass
+                raise
+
+            st = pool.stats()
+            yield JobEvent("metric", metrics={
+                "elapsed_s": time.perf_counter() - t0,
+                "pool_hits": st.hits,
+                "pool_misses": st.misses,
+                "pool_evictions": st.evictions,
+            })
+
+    async def run(self, items: list[Item], options: Options, output_pdf: OutputTarget) -> OutputTarget:
+        """イベントを読み捨てて完了まで待つ。戻り値は出力パス。"""
+        async for _ in self.events(items, options, output_pdf):
+            pass
+        return output_pdf
+
+    async def events_from_manifest(self, manifest_path: str) -> AsyncIterator[JobEvent]:
+        items, variants = load_manifest_outputs(manifest_path)
+        async for ev in self.events_variants(items, variants):
+            yield ev
+
+async def generate_pdf_async(items: list[Item], options: Options, output_pdf: OutputTarget) -> OutputTarget:
+    return await AsyncJobRunner(max_concurrency=1).run(items, options, output_pdf)
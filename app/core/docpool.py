@@ -0,0 +1,160 @@
+from __future__ import annotations
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Tuple
+import fitz  # PyMuPDF
+from .errors import UserFacingError
+
+def open_pdf_checked(path: str) -> fitz.Document:
+    try:
+        doc = fitz.open(path)
+    except Exception:
+        raise UserFacingError(f"PDFを開けません: {path}")
+    if getattr(doc, "needs_pass", False) and doc.needs_pass:
+        doc.close()
+        raise UserFacingError("パスワード保護PDFは非対応です。解除後のPDFを使用してください。")
+    if getattr(doc, "is_encrypted", False) and doc.is_encrypted:
+        doc.close()
+        raise UserFacingError("パスワード保護PDFは非対応です。解除後のPDFを使用してください。")
+    return doc
+
+def _file_stamp(path: str) -> Tuple[float, int]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (-1.0, -1)
+    return (st.st_mtime, st.st_size)
+
+@dataclass
+class PoolStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    open: int = 0
+
+@dataclass
+class _Entry:
+    doc: fitz.Document
+    stamp: Tuple[float, int]
+    refs: int = 0
+
+class DocumentPool:
+    """開いたPDFを使い回すLRUプール。
+
+    - 同時に開いておく文書数は max_open まで（参照中の文書は追い出さない）
+    - acquire/release で参照カウント。borrow() はそのコンテキストマネージャ版
+    - ファイルの mtime/サイズが変わっていたら開き直す
+    """
+
+    def __init__(self, max_open: int = 32):
+        self.max_open = max(1, max_open)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # 参照中に無効化された文書（release時に閉じる）
+        self._detached: Dict[int, _Entry] = {}
+        self._stats = PoolStats()
+        self._lock = threading.RLock()
+        # ページ数は文書を閉じた後も覚えておく（一覧の再構築で開き直さないため）
+        self._page_counts: Dict[str, Tuple[Tuple[float, int], int]] = {}
+
+    def acquire(self, path: str) -> fitz.Document:
+        with self._lock:
+            stamp = _file_stamp(path)
+            ent = self._entries.get(path)
+            if ent is not None and ent.stamp != stamp:
+                self._stats.invalidations += 1
+                self._drop(path)
+                ent = None
+            if ent is not None:
+                self._stats.hits += 1
+                self._entries.move_to_end(path)
+            else:
+                self._stats.misses += 1
+                ent = _Entry(doc=open_pdf_checked(path), stamp=stamp)
+                self._entries[path] = ent
+            ent.refs += 1
+            self._evict()
+            return ent.doc
+
+    def release(self, path: str, doc: fitz.Document) -> None:
+        with self._lock:
+            ent = self._entries.get(path)
+            if ent is not None and ent.doc is doc:
+                ent.refs = max(0, ent.refs - 1)
+                self._evict()
+                return
+            ent = self._detached.get(id(doc))
+            if ent is not None:
+                ent.refs -= 1
+                if ent.refs <= 0:
+                    del self._detached[id(doc)]
+                    _close_quietly(ent.doc)
+
+    def page_count(self, path: str) -> int:
+        stamp = _file_stamp(path)
+        with self._lock:
+            hit = self._page_counts.get(path)
+            if hit is not None and hit[0] == stamp:
+                return hit[1]
+        with self.borrow(path) as doc:
+            n = doc.page_count
+        with self._lock:
+            self._page_counts[path] = (stamp, n)
+        return n
+
+    @contextmanager
+    def borrow(self, path: str) -> Iterator[fitz.Document]:
+        doc = self.acquire(path)
+        try:
+            yield doc
+        finally:
+            self.release(path, doc)
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            if path in self._entries:
+                self._stats.invalidations += 1
+                self._drop(path)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            s = PoolStats(**vars(self._stats))
+            s.open = len(self._entries) + len(self._detached)
+            return s
+
+    def close(self) -> None:
+        with self._lock:
+            for path in list(self._entries):
+                self._drop(path)
+
+    def __enter__(self) -> "DocumentPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _drop(self, path: str) -> None:
+        ent = self._entries.pop(path)
+        if ent.refs > 0:
+            self._detached[id(ent.doc)] = ent
+        else:
+            _close_quietly(ent.doc)
+
+    def _evict(self) -> None:
+        if len(self._entries) <= self.max_open:
+            return
+        for path in list(self._entries):
+            if len(self._entries) <= self.max_open:
+                break
+            if self._entries[path].refs == 0:
+                self._stats.evictions += 1
+                _close_quietly(self._entries.pop(path).doc)
+
+def _close_quietly(doc: fitz.Document) -> None:
+    try:
+        doc.close()
+    except Exception:
+        pass
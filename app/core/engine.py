@@ -1,13 +1,17 @@
 from __future__ import annotations
-import io, json, os, shutil
-from typing import Callable, Optional, Dict
+import io, json, os, threading
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
 import fitz  # PyMuPDF
 from PIL import Image
 
-from .types import Item, Options, PageRef
-from .errors import UserFacingError, is_heic, is_supported_image, is_pdf
+from .types import Item, Options, OutputTarget, OutputVariant, PageRef
+from .errors import JobCanceled, UserFacingError, is_heic, is_supported_image, is_pdf
 from .plan import make_two_up_spreads_for_output, make_booklet_spreads
-from .render import open_pdf_checked, render_page_to_pil
+from .docpool import DocumentPool
+from .jobcache import JobCache, job_cache_key
+from .pipeline import OrderedPipeline, Stage
+from .render import RenderBudget, find_passthrough_page, render_page_to_pil
 
 # A4 landscape in points
 A4_LANDSCAPE_W_PT = 842
@@ -41,9 +45,11 @@ def validate_and_build_items(raw_items: list[dict]) -> list[Item]:
         items.append(Item(kind=kind, path=path, display_name=dn))
     return items
 
-def build_logical_pages(items: list[Item]) -> list[PageRef]:
+def build_logical_pages(items: list[Item], pool: Optional[DocumentPool] = None) -> list[PageRef]:
     pages: list[PageRef] = []
-    pdf_cache: Dict[str, fitz.Document] = {}
+    own_pool = pool is None
+    if own_pool:
+        pool = DocumentPool()
     try:
         for idx, it in enumerate(items):
             if it.kind == "blank":
@@ -51,29 +57,22 @@ def build_logical_pages(items: list[Item]) -> list[PageRef]:
             elif it.kind == "image":
                 pages.append(PageRef(item_index=idx, pdf_page_index=None, is_blank=False))
             elif it.kind == "pdf":
-                doc = pdf_cache.get(it.path)
-                if doc is None:
-                    doc = open_pdf_checked(it.path)
-                    pdf_cache[it.path] = doc
-                for pno in range(doc.page_count):
+                for pno in range(pool.page_count(it.path)):
                     pages.append(PageRef(item_index=idx, pdf_page_index=pno, is_blank=False))
             else:
                 raise UserFacingError(f"未知のItem.kind: {it.kind}")
     finally:
-        for d in pdf_cache.values():
-            try:
-                d.close()
-            except Exception:
-                pass
+        if own_pool:
+            pool.close()
     return pages
 
-def _insert_pil_image(page_out: fitz.Page, pil_img: Image.Image, rect: fitz.Rect, *, compress: bool, jpeg_quality: int) -> None:
+def _encode_pil_image(pil_img: Image.Image, *, compress: bool, jpeg_quality: int) -> bytes:
     buf = io.BytesIO()
     if compress:
         pil_img.save(buf, format="JPEG", quality=jpeg_quality)
     else:
         pil_img.save(buf, format="PNG", optimize=False)
-    page_out.insert_image(rect, stream=buf.getvalue())
+    return buf.getvalue()
 
 def _fit_rect_pts(img_w: int, img_h: int, box_w: float, box_h: float):
     if img_w <= 0 or img_h <= 0:
@@ -85,85 +84,509 @@ def _fit_rect_pts(img_w: int, img_h: int, box_w: float, box_h: float):
     y = (box_h - h) / 2
     return (x, y, w, h)
 
+@dataclass
+class _Slot:
+    """出力スプレッドの片側1枠。描画 → エンコード → 挿入の各段で順に埋まる"""
+    spread_index: int
+    x0: float
+    pref: Optional[PageRef]
+    passthrough: Optional[Tuple[str, int]] = None
+    image: Optional[Image.Image] = None
+    stream: Optional[bytes] = None
+    size: Tuple[int, int] = (0, 0)
+
+class _RenderPools:
+    """描画スレッドごとの DocumentPool。1つの fitz 文書を複数スレッドで同時に触らないよう、
+    最初の描画スレッドには呼び出し元のプールを、2本目以降にはそれぞれ専用のプールを割り当てる。"""
+
+    def __init__(self, shared: DocumentPool):
+        self._shared: Optional[DocumentPool] = shared
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owned: list[DocumentPool] = []
+
+    def get(self) -> DocumentPool:
+        pool = getattr(self._local, "pool", None)
+        if pool is None:
+            with self._lock:
+                pool, self._shared = self._shared, None
+                if pool is None:
+                    pool = DocumentPool(max_open=8)
+                    self._owned.append(pool)
+            self._local.pool = pool
+        return pool
+
+    def close(self) -> None:
+        for pool in self._owned:
+            pool.close()
+
+def _slot_fit_box(it: Item, dpi: int, box_w: float, box_h: float) -> Optional[Tuple[int, int]]:
+    """PDFページは配置先でちょうど dpi になる大きさで描く。画像アイテムは元の解像度のまま
+    埋め込む（縮小デコードはプレビューだけ）ので None。"""
+    if it.kind != "pdf":
+        return None
+    return (max(1, round(box_w * dpi / 72.0)), max(1, round(box_h * dpi / 72.0)))
+
+def _render_slot(
+    slot: _Slot,
+    items: list[Item],
+    box_w: float,
+    box_h: float,
+    *,
+    options: Options,
+    dpi: int,
+    pool: DocumentPool,
+    budget: Optional[RenderBudget] = None,
+) -> _Slot:
+    """画像1枚だけのPDFページは元の圧縮ストリームを移植するので印を付けるだけ。
+    それ以外はスロットに合わせた解像度でラスタライズする。空白は何もしない。"""
+    pref = slot.pref
+    slot.passthrough = find_passthrough_page(items, pref, options.grayscale, pool)
+    if slot.passthrough is not None:
+        return slot
+    if pref is None or pref.is_blank or pref.item_index < 0 or items[pref.item_index].kind == "blank":
+        return slot  # 空白は白紙のまま（A4全面の白画像を埋め込まない）
+
+    fit_box = _slot_fit_box(items[pref.item_index], dpi, box_w, box_h)
+    slot.image = render_page_to_pil(items, pref, dpi=dpi, grayscale=options.grayscale, pool=pool, budget=budget, fit_box=fit_box)
+    return slot
+
+def _encode_slot(slot: _Slot, *, options: Options, jpegq: int) -> _Slot:
+    if slot.image is not None:
+        slot.size = slot.image.size
+        slot.stream = _encode_pil_image(slot.image, compress=options.compress, jpeg_quality=jpegq)
+        slot.image = None  # 画素はここで手放す
+    return slot
+
+def _insert_slot(page_out: fitz.Page, slot: _Slot, box_w: float, box_h: float, pool: DocumentPool) -> bool:
+    """描画・エンコード済みの枠を出力ページへ置く。元画像を移植したら True。
+    pool は挿入スレッド専用のもの（描画スレッドのプールとは共有しない）。"""
+    x0 = slot.x0
+    if slot.passthrough is not None:
+        path, pno = slot.passthrough
+        with pool.borrow(path) as doc:
+            r = doc.load_page(pno).rect
+            x, y, w, h = _fit_rect_pts(r.width, r.height, box_w, box_h)
+            page_out.show_pdf_page(fitz.Rect(x0+x, y, x0+x+w, y+h), doc, pno)
+        return True
+    if slot.stream is not None:
+        x, y, w, h = _fit_rect_pts(slot.size[0], slot.size[1], box_w, box_h)
+        page_out.insert_image(fitz.Rect(x0+x, y, x0+x+w, y+h), stream=slot.stream)
+    return False
+
+def _save_output(doc_out: fitz.Document, output_pdf: OutputTarget) -> None:
+    """ストリームやFIFO等へは直接書き出し、通常ファイルへは同じフォルダの一時ファイル経由で置き換える"""
+    if hasattr(output_pdf, "write"):
+        output_pdf.write(doc_out.tobytes())
+        output_pdf.flush()
+        return
+    if os.path.exists(output_pdf) and not os.path.isfile(output_pdf):
+        with open(output_pdf, "wb") as f:
+            f.write(doc_out.tobytes())
+        return
+
+    out_dir = os.path.dirname(os.path.abspath(output_pdf)) or os.getcwd()
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_path = os.path.join(out_dir, f".tmp_{os.path.basename(output_pdf)}")
+    try:
+        doc_out.save(tmp_path)
+        os.replace(tmp_path, output_pdf)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 def generate_pdf(
     items: list[Item],
     options: Options,
-    output_pdf: str,
+    output_pdf: OutputTarget,
     progress_cb: Optional[Callable[[int, int], None]] = None,
     cancel_cb: Optional[Callable[[], bool]] = None,
     log_cb: Optional[Callable[[str], None]] = None,
+    pool: Optional[DocumentPool] = None,
+) -> None:
+    """output_pdf はパスまたは書き込み可能なバイナリストリーム。
+    pool を省略するとジョブ専用のプール（同時オープン数に上限あり）を使う。"""
+    own_pool = pool is None
+    if own_pool:
+        pool = DocumentPool()
+    try:
+        _generate_pdf(items, options, output_pdf, progress_cb, cancel_cb, log_cb, pool)
+    finally:
+        if own_pool:
+            pool.close()
+
+def _generate_pdf(
+    items: list[Item],
+    options: Options,
+    output_pdf: OutputTarget,
+    progress_cb: Optional[Callable[[int, int], None]],
+    cancel_cb: Optional[Callable[[], bool]],
+    log_cb: Optional[Callable[[str], None]],
+    pool: DocumentPool,
 ) -> None:
-    pages = build_logical_pages(items)
+    # プールは前のジョブと共有されうる（GUIのジョブキューは実行枠ごとに1つ）ので、統計はこのジョブの差分を出す
+    st0 = pool.stats()
+    pages = build_logical_pages(items, pool)
 
     if options.mode == "booklet":
         spreads = make_booklet_spreads(pages)
     else:
         spreads = make_two_up_spreads_for_output(pages, options.cover_preview)
 
-    out_dir = os.path.dirname(os.path.abspath(output_pdf)) or os.getcwd()
-    os.makedirs(out_dir, exist_ok=True)
-    tmp_path = os.path.join(out_dir, f".tmp_{os.path.basename(output_pdf)}")
-
     dpi = options.dpi_compress if options.compress else options.dpi_normal
     jpegq = options.jpegq_compress if options.compress else options.jpegq_normal
 
-    pdf_cache: Dict[str, fitz.Document] = {}
     doc_out = fitz.open()
     total = len(spreads)
+    passthrough = 0
 
     def _log(msg: str):
         if log_cb:
             log_cb(msg)
 
+    budget = RenderBudget(
+        seconds=options.page_time_budget_s,
+        min_dpi=min(dpi, options.min_fallback_dpi),
+        cancel_cb=cancel_cb,
+        log_cb=_log,
+    )
+
+    half_w = A4_LANDSCAPE_W_PT / 2
+    H = A4_LANDSCAPE_H_PT
+    slots = [
+        _Slot(spread_index=i, x0=x0, pref=pref)
+        for i, sp in enumerate(spreads)
+        for pref, x0 in ((sp.left, 0.0), (sp.right, half_w))
+    ]
+    # 描画（fitz/Pillow）→ エンコード（Pillow。GILを離すので次ページの描画と重なる）→ 挿入（このスレッドで入力順）
+    render_pools = _RenderPools(pool)
+    insert_pool = DocumentPool(max_open=4)
+    pipeline = OrderedPipeline(
+        [
+            Stage("render", lambda sl: _render_slot(sl, items, half_w, H, options=options, dpi=dpi,
+                                                    pool=render_pools.get(), budget=budget),
+                  options.render_threads),
+            Stage("encode", lambda sl: _encode_slot(sl, options=options, jpegq=jpegq), options.encode_threads),
+        ],
+        max_inflight=options.pipeline_depth,
+    )
+
     try:
-        for i, sp in enumerate(spreads, start=1):
-            if cancel_cb and cancel_cb():
-                raise UserFacingError("中断しました。")
+        with pipeline:
+            for sl in pipeline.run(slots):
+                if cancel_cb and cancel_cb():
+                    raise JobCanceled()
+                if sl.x0 == 0.0:
+                    page_out = doc_out.new_page(width=A4_LANDSCAPE_W_PT, height=A4_LANDSCAPE_H_PT)
+                if _insert_slot(page_out, sl, half_w, H, insert_pool):
+                    passthrough += 1
+                if sl.x0 == 0.0:
+                    continue  # 右側まで置いたらスプレッド完了
 
-            page_out = doc_out.new_page(width=A4_LANDSCAPE_W_PT, height=A4_LANDSCAPE_H_PT)
-            half_w = A4_LANDSCAPE_W_PT / 2
-            H = A4_LANDSCAPE_H_PT
+                i = sl.spread_index + 1
+                if progress_cb:
+                    progress_cb(i, total)
+                if i == 1 or i == total or i % 10 == 0:
+                    _log(f"{i}/{total} ページ（出力スプレッド）を処理しました")
 
-            left_img = render_page_to_pil(items, sp.left, dpi=dpi, grayscale=options.grayscale, pdf_cache=pdf_cache)
-            lx, ly, lw, lh = _fit_rect_pts(left_img.width, left_img.height, half_w, H)
-            _insert_pil_image(page_out, left_img, fitz.Rect(lx, ly, lx+lw, ly+lh), compress=options.compress, jpeg_quality=jpegq)
+        if passthrough:
+            _log(f"スキャン画像ページ {passthrough} 件は再ラスタライズせずに元画像を移植しました")
+        st = pool.stats()
+        _log(
+            f"文書プール: hit={st.hits - st0.hits} miss={st.misses - st0.misses} "
+            f"evict={st.evictions - st0.evictions} invalidate={st.invalidations - st0.invalidations}"
+        )
+        # 保存自体は中断できないので直前にもう一度確認する
+        if cancel_cb and cancel_cb():
+            raise JobCanceled()
+        _save_output(doc_out, output_pdf)
+    except UserFacingError:
+        raise
+    except Exception as e:
+        raise UserFacingError(f"生成中にエラーが発生しました: {e}")
+    finally:
+        render_pools.close()
+        insert_pool.close()
+        doc_out.close()
 
-            right_img = render_page_to_pil(items, sp.right, dpi=dpi, grayscale=options.grayscale, pdf_cache=pdf_cache)
-            rx0 = half_w
-            rx, ry, rw, rh = _fit_rect_pts(right_img.width, right_img.height, half_w, H)
-            _insert_pil_image(page_out, right_img, fitz.Rect(rx0+rx, ry, rx0+rx+rw, ry+rh), compress=options.compress, jpeg_quality=jpegq)
+@dataclass
+class _Target:
+    """論理ページ1枚の配置先（何番目の出力の、何ページ目の、どちら側か）"""
+    variant: int
+    page_no: int
+    x0: float
 
-            if progress_cb:
-                progress_cb(i, total)
-            if i == 1 or i == total or i % 10 == 0:
-                _log(f"{i}/{total} ページ（出力スプレッド）を処理しました")
+@dataclass
+class _PageWork:
+    """論理ページ1枚分の仕事。描画 → エンコード → 挿入の各段で順に埋まる"""
+    pref: PageRef
+    targets: List[_Target]
+    passthrough: Optional[Tuple[str, int]] = None  # カラー出力向け（グレースケールは常にラスタライズ）
+    images: Dict[Tuple[int, bool], Image.Image] = field(default_factory=dict)  # (dpi, grayscale) → 画像
+    streams: Dict[Tuple[int, bool, bool, int], Tuple[bytes, Tuple[int, int]]] = field(default_factory=dict)
+    renders: int = 0
 
-        doc_out.save(tmp_path)
+def _variant_dpi(options: Options) -> int:
+    return options.dpi_compress if options.compress else options.dpi_normal
+
+def _variant_jpegq(options: Options) -> int:
+    return options.jpegq_compress if options.compress else options.jpegq_normal
+
+def _stream_key(options: Options) -> Tuple[int, bool, bool, int]:
+    return (_variant_dpi(options), options.grayscale, options.compress, _variant_jpegq(options))
+
+def generate_pdfs(
+    items: list[Item],
+    variants: List[OutputVariant],
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+    cancel_cb: Optional[Callable[[], bool]] = None,
+    log_cb: Optional[Callable[[str], None]] = None,
+    pool: Optional[DocumentPool] = None,
+) -> None:
+    """同じ items から複数の出力（ブックレット＋2-in-1、通常＋省サイズ、カラー＋グレースケール等）を1回で作る。
+
+    論理ページを先頭から1枚ずつ、必要な dpi ごとに1回だけ描画し、それを全出力の面付け先へ配置する。
+    エンコード結果も (dpi, 色, 圧縮, 品質) が同じ出力どうしで共有する。グレースケールの出力は
+    カラーで描いた画像を変換して作る（dpi が同じカラー出力が無ければ最初からグレーで描く）。
+    スレッド数・時間予算などの実行設定は先頭の出力の Options を使う。
+    進捗は論理ページ単位で通知する。出力が1つなら generate_pdf と同じ。
+    """
+    if not variants:
+        raise UserFacingError("出力が指定されていません。")
+    paths = [v.output for v in variants if isinstance(v.output, str)]
+    if len({os.path.abspath(p) for p in paths}) != len(paths):
+        raise UserFacingError("同じ出力先が複数指定されています。")
+    if len(variants) == 1:
+        v = variants[0]
+        generate_pdf(items, v.options, v.output, progress_cb, cancel_cb, log_cb, pool)
+        return
+
+    own_pool = pool is None
+    if own_pool:
+        pool = DocumentPool()
+    try:
+        _generate_pdfs(items, variants, progress_cb, cancel_cb, log_cb, pool)
+    finally:
+        if own_pool:
+            pool.close()
+
+def _generate_pdfs(
+    items: list[Item],
+    variants: List[OutputVariant],
+    progress_cb: Optional[Callable[[int, int], None]],
+    cancel_cb: Optional[Callable[[], bool]],
+    log_cb: Optional[Callable[[str], None]],
+    pool: DocumentPool,
+) -> None:
+    pages = build_logical_pages(items, pool)
+    index_of = {id(p): i for i, p in enumerate(pages)}
+    run_opts = variants[0].options
+    half_w = A4_LANDSCAPE_W_PT / 2
+    H = A4_LANDSCAPE_H_PT
+
+    def _log(msg: str):
+        if log_cb:
+            log_cb(msg)
+
+    # 各出力の面付けを先に決め、出力ページも先に全部作っておく（論理ページ順に埋めていく）
+    docs_out = [fitz.open() for _ in variants]
+    works = [_PageWork(pref=p, targets=[]) for p in pages]
+    for k, v in enumerate(variants):
+        if v.options.mode == "booklet":
+            spreads = make_booklet_spreads(pages)
+        else:
+            spreads = make_two_up_spreads_for_output(pages, v.options.cover_preview)
+        for page_no, sp in enumerate(spreads):
+            docs_out[k].new_page(width=A4_LANDSCAPE_W_PT, height=A4_LANDSCAPE_H_PT)
+            for pref, x0 in ((sp.left, 0.0), (sp.right, half_w)):
+                idx = index_of.get(id(pref)) if pref is not None else None
+                if idx is None or pref.is_blank or items[pref.item_index].kind == "blank":
+                    continue  # 余白埋めの空白・空白アイテムは白紙のまま
+                works[idx].targets.append(_Target(variant=k, page_no=page_no, x0=x0))
+    works = [w for w in works if w.targets]
+
+    budgets: Dict[int, RenderBudget] = {}
+    for v in variants:
+        dpi = _variant_dpi(v.options)
+        budgets.setdefault(dpi, RenderBudget(
+            seconds=run_opts.page_time_budget_s,
+            min_dpi=min(dpi, run_opts.min_fallback_dpi),
+            cancel_cb=cancel_cb,
+            log_cb=_log,
+        ))
+
+    def render(w: _PageWork) -> _PageWork:
+        rpool = render_pools.get()
+        opts = [variants[t.variant].options for t in w.targets]
+        if any(not o.grayscale for o in opts):
+            w.passthrough = find_passthrough_page(items, w.pref, False, rpool)
+        need: Dict[int, set] = {}
+        for o in opts:
+            if o.grayscale or w.passthrough is None:
+                need.setdefault(_variant_dpi(o), set()).add(o.grayscale)
+        for dpi, grays in need.items():
+            only_gray = grays == {True}
+            fit_box = _slot_fit_box(items[w.pref.item_index], dpi, half_w, H)
+            base = render_page_to_pil(items, w.pref, dpi=dpi, grayscale=only_gray, pool=rpool,
+                                      budget=budgets[dpi], fit_box=fit_box)
+            w.renders += 1
+            for g in grays:
+                w.images[(dpi, g)] = base if g == only_gray else base.convert("L").convert("RGB")
+        return w
+
+    def encode(w: _PageWork) -> _PageWork:
+        for t in w.targets:
+            o = variants[t.variant].options
+            key = _stream_key(o)
+            img = w.images.get(key[:2])
+            if img is None or key in w.streams:
+                continue
+            w.streams[key] = (_encode_pil_image(img, compress=o.compress, jpeg_quality=key[3]), img.size)
+        w.images.clear()  # 画素はここで手放す
+        return w
+
+    render_pools = _RenderPools(pool)
+    insert_pool = DocumentPool(max_open=4)
+    pipeline = OrderedPipeline(
+        [Stage("render", render, run_opts.render_threads), Stage("encode", encode, run_opts.encode_threads)],
+        max_inflight=run_opts.pipeline_depth,
+    )
+    total = len(works)
+    renders = encodes = 0
+    try:
+        with pipeline:
+            for i, w in enumerate(pipeline.run(works), start=1):
+                if cancel_cb and cancel_cb():
+                    raise JobCanceled()
+                for t in w.targets:
+                    o = variants[t.variant].options
+                    page_out = docs_out[t.variant][t.page_no]
+                    slot = _Slot(spread_index=t.page_no, x0=t.x0, pref=w.pref)
+                    if o.grayscale or w.passthrough is None:
+                        slot.stream, slot.size = w.streams[_stream_key(o)]
+                    else:
+                        slot.passthrough = w.passthrough
+                    _insert_slot(page_out, slot, half_w, H, insert_pool)
+                renders += w.renders
+                encodes += len(w.streams)
+                if progress_cb:
+                    progress_cb(i, total)
+                if i == 1 or i == total or i % 10 == 0:
+                    _log(f"{i}/{total} ページ（入力）を処理しました")
+
+        placed = sum(len(w.targets) for w in works)
+        _log(f"{len(variants)} 出力・{placed} 面を 描画 {renders} 回・エンコード {encodes} 回で作成しました")
+        if cancel_cb and cancel_cb():
+            raise JobCanceled()
+        for doc_out, v in zip(docs_out, variants):
+            _save_output(doc_out, v.output)
     except UserFacingError:
         raise
     except Exception as e:
         raise UserFacingError(f"生成中にエラーが発生しました: {e}")
     finally:
-        doc_out.close()
-        for d in pdf_cache.values():
-            try:
-                d.close()
-            except Exception:
-                pass
-    shutil.move(tmp_path, output_pdf)
-
-def run_job_from_manifest(manifest_path: str) -> None:
+        render_pools.close()
+        insert_pool.close()
+        for doc_out in docs_out:
+            doc_out.close()
+
+# manifest の options で指定できる項目
+_MANIFEST_OPTION_KEYS = (
+    "mode", "cover_preview", "grayscale", "compress", "page_time_budget_s",
+    "render_threads", "encode_threads", "pipeline_depth",
+)
+
+def _options_from_manifest(opt: dict, base: Optional[Options] = None) -> Options:
+    base = base if base is not None else Options()
+    return replace(base, **{k: opt[k] for k in _MANIFEST_OPTION_KEYS if k in opt})
+
+def load_manifest_outputs(manifest_path: str) -> tuple[list[Item], List[OutputVariant]]:
+    """manifest(JSON) を読み込み (items, 出力のリスト) を返す。
+
+    "outputs": [{"output_pdf": ..., "options": {...}}, ...] があれば出力ごとに、
+    トップレベルの options を各出力の options で上書きしたものを使う。無ければ output_pdf の1つだけ。
+    """
     with open(manifest_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
     items = validate_and_build_items(data["items"])
-    opt = data.get("options", {})
+    base = _options_from_manifest(data.get("options", {}))
+    outputs = data.get("outputs")
+    if not outputs:
+        return items, [OutputVariant(options=base, output=data["output_pdf"])]
+    variants = [
+        OutputVariant(options=_options_from_manifest(o.get("options", {}), base), output=o["output_pdf"])
+        for o in outputs
+    ]
+    return items, variants
 
-    options = Options(
-        mode=opt.get("mode", "booklet"),
-        cover_preview=opt.get("cover_preview", True),
-        grayscale=opt.get("grayscale", False),
-        compress=opt.get("compress", False),
-    )
-    output_pdf = data["output_pdf"]
-    generate_pdf(items, options, output_pdf)
+def load_manifest(manifest_path: str) -> tuple[list[Item], Options, str]:
+    """manifest(JSON) を読み込み (items, options, output_pdf) を返す。
+    出力が複数ある manifest は load_manifest_outputs で読むこと（ここではエラー）。"""
+    items, variants = load_manifest_outputs(manifest_path)
+    if len(variants) > 1:
+        raise UserFacingError("出力が複数ある manifest です。load_manifest_outputs を使ってください。")
+    return items, variants[0].options, variants[0].output
+
+def _is_regular_target(target: OutputTarget) -> bool:
+    return isinstance(target, str) and (not os.path.exists(target) or os.path.isfile(target))
+
+def _cache_fetch(cache: JobCache, key: str, target: OutputTarget, log_cb: Optional[Callable[[str], None]]) -> bool:
+    try:
+        return cache.fetch(key, target)
+    except OSError as e:
+        if log_cb:
+            log_cb(f"キャッシュを読めません（生成します）: {e}")
+        return False
+
+def _cache_store(store: Callable[[], None], log_cb: Optional[Callable[[str], None]]) -> None:
+    try:
+        store()
+    except OSError as e:
+        if log_cb:
+            log_cb(f"キャッシュに保存できません: {e}")
+
+def run_job_from_manifest(
+    manifest_path: str,
+    output: Optional[OutputTarget] = None,
+    cache: Optional[JobCache] = None,
+    log_cb: Optional[Callable[[str], None]] = None,
+) -> bool:
+    """output を指定すると manifest の output_pdf より優先する（出力が1つの manifest のみ）。
+    cache を渡すと同一内容のジョブは生成済みPDFを返す。全出力をキャッシュから返したら True。
+    出力が複数あれば、キャッシュに無かった分だけを generate_pdfs でまとめて生成する。
+    キャッシュは補助なので、その読み書きの失敗は log_cb に知らせるだけで生成は続ける。"""
+    items, variants = load_manifest_outputs(manifest_path)
+    if output is not None:
+        if len(variants) > 1:
+            raise UserFacingError("出力が複数ある manifest では出力先を上書きできません。")
+        variants = [OutputVariant(options=variants[0].options, output=output)]
+    if cache is None:
+        generate_pdfs(items, variants)
+        return False
+
+    todo = []
+    for v in variants:
+        key = job_cache_key(items, v.options)
+        if not _cache_fetch(cache, key, v.output, log_cb):
+            todo.append((key, v))
+    if not todo:
+        return True
+
+    # 通常ファイルへはそのまま書いてから取り込み、ストリーム等へはメモリ上で作ってから書き出す
+    gen = [v if _is_regular_target(v.output) else OutputVariant(options=v.options, output=io.BytesIO()) for _, v in todo]
+    generate_pdfs(items, gen)
+    for (key, v), g in zip(todo, gen):
+        if g is v:
+            _cache_store(lambda: cache.store_file(key, v.output), log_cb)
+            continue
+        data = g.output.getvalue()
+        if isinstance(v.output, str):
+            with open(v.output, "wb") as f:
+                f.write(data)
+        else:
+            v.output.write(data)
+            v.output.flush()
+        _cache_store(lambda: cache.store_bytes(key, data), log_cb)
+    return False
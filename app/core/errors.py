@@ -1,6 +1,12 @@
 class UserFacingError(Exception):
     """UI/CLIでそのまま表示してよいエラー"""
 
+class JobCanceled(UserFacingError):
+    """cancel_cb などによる中断"""
+
+    def __init__(self, msg: str = "中断しました。"):
+        super().__init__(msg)
+
 def is_heic(path: str) -> bool:
     p = path.lower()
     return p.endswith(".heic") or p.endswith(".heif")
@@ -0,0 +1,164 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import asdict
+from typing import Optional
+
+from .types import Item, Options, OutputTarget
+
+# 出力内容に影響する変更をエンジンに入れたら上げる（古いキャッシュを無効化するため）
+ENGINE_VERSION = "1"
+
+# 出力内容に影響しない（実行方法だけの）設定はキーに含めない
+_RUNTIME_OPTIONS = ("render_threads", "encode_threads", "pipeline_depth")
+
+def default_cache_dir() -> str:
+    env = os.environ.get("PDF2BOOKLET_CACHE_DIR")
+    if env:
+        return env
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "PDF2Booklet", "jobcache")
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def job_cache_key(items: list[Item], options: Options, *, hash_inputs: bool = False) -> str:
+    """items・Options・各入力の (サイズ, mtime) またはハッシュ・エンジン版数から作るキー"""
+    norm_items = []
+    for it in items:
+        d = {"kind": it.kind, "rotation": it.rotation}
+        if it.path:
+            st = os.stat(it.path)
+            d["path"] = os.path.normcase(os.path.abspath(it.path))
+            d["size"] = st.st_size
+            if hash_inputs:
+                d["sha256"] = _file_digest(it.path)
+            else:
+                d["mtime_ns"] = st.st_mtime_ns
+        norm_items.append(d)
+    opts = {k: v for k, v in asdict(options).items() if k not in _RUNTIME_OPTIONS}
+    payload = {"engine": ENGINE_VERSION, "items": norm_items, "options": opts}
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+class JobCache:
+    """ジョブ単位の出力PDFキャッシュ（キー → 生成済みPDF）。
+
+    合計サイズが max_bytes を超えたら最後に使われたのが古いものから消す。
+    ヒット時は出力先へコピーする（link=True ならハードリンクを試す）。
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = 1 << 30, link: bool = False):
+        self.root = root or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.link = link
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.pdf")
+
+    def fetch(self, key: str, output: OutputTarget) -> bool:
+        """キャッシュにあれば output へ書き出して True"""
+        src = self._entry(key)
+        if not os.path.isfile(src):
+            return False
+        try:
+            os.utime(src)  # LRU用に最終利用時刻を更新
+        except OSError:
+            pass
+        if hasattr(output, "write"):
+            with open(src, "rb") as f:
+                shutil.copyfileobj(f, output)
+            output.flush()
+            return True
+
+        out_dir = os.path.dirname(os.path.abspath(output)) or os.getcwd()
+        os.makedirs(out_dir, exist_ok=True)
+        if self.link:
+            try:
+                if os.path.exists(output):
+                    os.remove(output)
+                os.link(src, output)
+                return True
+            except OSError:
+                pass
+        _atomic_copy(src, output, out_dir)
+        return True
+
+    def store_file(self, key: str, path: str) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        _atomic_copy(path, self._entry(key), self.root)
+        self._evict()
+
+    def store_bytes(self, key: str, data: bytes) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=".pdf", dir=self.root)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._entry(key))
+        self._evict()
+
+    def clear(self) -> int:
+        """全エントリを削除し、削除件数を返す"""
+        n = 0
+        for name in _list_entries(self.root):
+            try:
+                os.remove(os.path.join(self.root, name))
+                n += 1
+            except OSError:
+                pass
+        return n
+
+    def _evict(self) -> None:
+        entries = []
+        for name in _list_entries(self.root):
+            p = os.path.join(self.root, name)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(e[1] for e in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass
+
+def _list_entries(root: str) -> list[str]:
+    try:
+        return [n for n in os.listdir(root) if n.endswith(".pdf") and not n.startswith(".tmp_")]
+    except FileNotFoundError:
+        return []
+
+def _new_file_mode(path: str) -> int:
+    """既存ファイルならその権限、無ければ umask を反映した通常の新規ファイルの権限"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        pass
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def _atomic_copy(src: str, dst: str, dst_dir: str) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=".pdf", dir=dst_dir)
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp)
+        # mkstemp は 0600 で作るので、普通に書き出したファイルと同じ権限に揃える
+        os.chmod(tmp, _new_file_mode(dst))
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# 待機中のスレッドが停止要求に気付くまでの間隔
+_POLL_S = 0.05
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Any], Any]
+    threads: int = 1
+
+class _Failure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+class OrderedPipeline:
+    """入力を順に複数段（各段 N スレッド）へ流し、結果を入力順で返すパイプライン。
+
+    - パイプライン内（各段のキュー・処理中・並べ替え待ち）に同時に存在できる要素は max_inflight 個まで。
+      取り出し側が遅ければ投入側が待つ（背圧）ので、メモリ使用量はこれで頭打ちになる
+    - ある要素で例外が出たら、以降の段は素通しして入力順でその位置に来たときに送出する
+      （直列実行と同じ例外が同じ順番で出る）
+    - close()（with を抜けたとき）で未処理の要素を捨てて全スレッドを止める
+    """
+
+    def __init__(self, stages: Sequence[Stage], max_inflight: int = 8):
+        if not stages:
+            raise ValueError("stages is empty")
+        self.stages = list(stages)
+        self.max_inflight = max(1, max_inflight)
+        self._slots = threading.Semaphore(self.max_inflight)
+        # 件数の上限はセマフォが受け持つ。キュー自体は無制限にして put が決して詰まらないようにする
+        # （途中で打ち切ったとき、満杯のキューへの put で止まったスレッドが join を塞がないため）
+        self._queues: List[queue.Queue] = [queue.Queue() for _ in range(len(self.stages) + 1)]
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def run(self, inputs: Iterable[Any]) -> Iterator[Any]:
+        """各入力に全段を適用した結果を入力順に返す"""
+        inputs = list(inputs)
+        feeder = threading.Thread(target=self._feed, args=(inputs,), name="pipeline-feed", daemon=True)
+        self._threads.append(feeder)
+        for k, st in enumerate(self.stages):
+            for j in range(max(1, st.threads)):
+                t = threading.Thread(target=self._work, args=(k,), name=f"pipeline-{st.name}-{j}", daemon=True)
+                self._threads.append(t)
+        for t in self._threads:
+            t.start()
+
+        done: Dict[int, Any] = {}
+        out = self._queues[-1]
+        for seq in range(len(inputs)):
+            while seq not in done:
+                got = self._get(out)
+                if got is None:
+                    return
+                done[got[0]] = got[1]
+            res = done.pop(seq)
+            self._slots.release()
+            if isinstance(res, _Failure):
+                raise res.exc
+            yield res
+
+    def close(self) -> None:
+        self._stop.set()
+        for t in self._threads:
+            t.join()
+        self._threads.clear()
+
+    def __enter__(self) -> "OrderedPipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _get(self, q: queue.Queue) -> Optional[tuple]:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=_POLL_S)
+            except queue.Empty:
+                continue
+        return None
+
+    def _feed(self, inputs: List[Any]) -> None:
+        first = self._queues[0]
+        for seq, x in enumerate(inputs):
+            while not self._slots.acquire(timeout=_POLL_S):
+                if self._stop.is_set():
+                    return
+            if self._stop.is_set():
+                return
+            first.put((seq, x))
+
+    def _work(self, k: int) -> None:
+        fn = self.stages[k].fn
+        src, dst = self._queues[k], self._queues[k + 1]
+        while True:
+            got = self._get(src)
+            if got is None:
+                return
+            seq, x = got
+            if not isinstance(x, _Failure):
+                try:
+                    x = fn(x)
+                except BaseException as e:
+                    x = _Failure(e)
+            dst.put((seq, x))
@@ -1,9 +1,13 @@
 from __future__ import annotations
-from typing import Dict, Optional, Tuple
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Tuple
 import fitz  # PyMuPDF
 from PIL import Image, ImageOps
 from .types import Item, PageRef, Spread
-from .errors import UserFacingError
+from .errors import JobCanceled
+from .docpool import DocumentPool, open_pdf_checked  # noqa: F401  (open_pdf_checked は互換のため再公開)
 
 # A4 landscape in inches
 A4_LANDSCAPE_IN = (11.69, 8.27)
@@ -13,26 +17,148 @@ def blank_pil(dpi: int) -> Image.Image:
     h = int(A4_LANDSCAPE_IN[1] * dpi)
     return Image.new("RGB", (w, h), "white")
 
-def open_pdf_checked(path: str) -> fitz.Document:
+@contextmanager
+def _borrow_doc(pool: Optional[DocumentPool], path: str) -> Iterator[fitz.Document]:
+    """プールがあれば借用、無ければその場で開いて閉じる"""
+    if pool is not None:
+        with pool.borrow(path) as doc:
+            yield doc
+        return
+    doc = open_pdf_checked(path)
     try:
-        doc = fitz.open(path)
-    except Exception:
-        raise UserFacingError(f"PDFを開けません: {path}")
-    if getattr(doc, "needs_pass", False) and doc.needs_pass:
-        doc.close()
-        raise UserFacingError("パスワード保護PDFは非対応です。解除後のPDFを使用してください。")
-    if getattr(doc, "is_encrypted", False) and doc.is_encrypted:
+        yield doc
+    finally:
         doc.close()
-        raise UserFacingError("パスワード保護PDFは非対応です。解除後のPDFを使用してください。")
-    return doc
+
+def is_single_image_page(page: fitz.Page) -> bool:
+    """画像XObject 1枚だけで構成されたページか（スキャンPDFの典型）。
+    テキスト・ベクター描画・注釈が1つでもあれば False。"""
+    if page.first_annot is not None:
+        return False
+    # 内容の走査は get_bboxlog の1回だけ（描画命令ごとの種類と範囲。パスの辞書は作らない）。
+    # その前にリソース一覧で安く弾く
+    if len(page.get_images()) != 1:
+        return False
+    log = page.get_bboxlog()
+    return len(log) == 1 and log[0][0] == "fill-image"
+
+def find_passthrough_page(
+    items: list[Item],
+    pref: Optional[PageRef],
+    grayscale: bool,
+    pool: Optional[DocumentPool] = None,
+) -> Optional[Tuple[str, int]]:
+    """再ラスタライズせず元の画像ストリームをそのまま移植できるPDFページなら (path, page_no) を返す。
+    グレースケール変換が必要な場合は常に None（ラスタライズにフォールバック）。"""
+    if grayscale or pref is None or pref.is_blank or pref.item_index < 0:
+        return None
+    it = items[pref.item_index]
+    if it.kind != "pdf":
+        return None
+    with _borrow_doc(pool, it.path) as doc:
+        if not is_single_image_page(doc.load_page(pref.pdf_page_index)):
+            return None
+    return it.path, pref.pdf_page_index
+
+@dataclass
+class RenderBudget:
+    """PDFページのラスタライズ制御。
+
+    ページを tiles 本の横帯に分けて描画し、帯ごとに中断確認と経過時間チェックを行う。
+    seconds を超えそう（経過時間超過、または見込みが2倍超）なら dpi を半分にして描き直し、
+    min_dpi まで下げたら予算に関係なく最後まで描く（中断は常に受け付ける）。
+    """
+    seconds: float = 0.0  # 0 以下で時間制限なし（中断確認のみ）
+    min_dpi: int = 72
+    tiles: int = 8
+    cancel_cb: Optional[Callable[[], bool]] = None
+    log_cb: Optional[Callable[[str], None]] = None
+
+def _render_tiles(dl: fitz.DisplayList, zoom: float, budget: RenderBudget, enforce: bool) -> Optional[fitz.Pixmap]:
+    rect = dl.rect
+    mat = fitz.Matrix(zoom, zoom)
+    out = fitz.Pixmap(fitz.csRGB, (rect * mat).irect, False)
+    out.clear_with(255)
+    n = max(1, budget.tiles)
+    band_h = rect.height / n
+    t0 = time.perf_counter()
+    for k in range(n):
+        if budget.cancel_cb and budget.cancel_cb():
+            raise JobCanceled()
+        clip = fitz.Rect(rect.x0, rect.y0 + k * band_h, rect.x1, rect.y0 + (k + 1) * band_h)
+        tile = dl.get_pixmap(matrix=mat, clip=clip, alpha=False)
+        out.copy(tile, tile.irect)
+        if enforce:
+            elapsed = time.perf_counter() - t0
+            if elapsed > budget.seconds or elapsed / (k + 1) * n > budget.seconds * 2:
+                return None
+    return out
+
+def _rasterize_pdf_page(
+    page: fitz.Page,
+    dpi: int,
+    budget: Optional[RenderBudget],
+    label: str,
+    fit_box: Optional[Tuple[int, int]] = None,
+) -> fitz.Pixmap:
+    """dpi は配置後の実効解像度。fit_box（dpi換算の配置先ピクセル）があれば、ページを枠に
+    フィットさせた縮尺込みで描くので、大判ページも小さいページも配置先でちょうど dpi になる。"""
+    scale = 1.0
+    if fit_box is not None and page.rect.width > 0 and page.rect.height > 0:
+        px_per_pt = dpi / 72.0
+        scale = min(fit_box[0] / (page.rect.width * px_per_pt), fit_box[1] / (page.rect.height * px_per_pt))
+
+    if budget is None:
+        z = scale * dpi / 72.0
+        return page.get_pixmap(matrix=fitz.Matrix(z, z), alpha=False)
+
+    dl = page.get_displaylist()
+    cur = dpi
+    while True:
+        enforce = budget.seconds > 0 and cur > budget.min_dpi
+        pix = _render_tiles(dl, scale * cur / 72.0, budget, enforce)
+        if pix is not None:
+            return pix
+        nxt = max(budget.min_dpi, cur // 2)
+        if budget.log_cb:
+            budget.log_cb(f"{label}: 描画が{budget.seconds:g}秒の予算を超えるため {cur}dpi → {nxt}dpi で描き直します")
+        cur = nxt
+
+# EXIF Orientation のうち縦横が入れ替わるもの
+_EXIF_SWAPS_AXES = {5, 6, 7, 8}
+
+def _open_image(path: str, fit_box: Optional[Tuple[int, int]], grayscale: bool) -> Image.Image:
+    """画像を開く。fit_box (w, h) があれば、その枠にフィットする大きさ以上で縮小デコードする。
+    JPEGはDCT段階の縮小（draft: 1/2〜1/8）、それ以外は読み込み後に reduce() で整数倍縮小。"""
+    im = Image.open(path)
+    if fit_box is not None:
+        bw, bh = fit_box
+        if im.getexif().get(0x0112) in _EXIF_SWAPS_AXES:
+            bw, bh = bh, bw
+        scale = min(bw / im.width, bh / im.height)
+        if scale < 1:
+            tw, th = max(1, int(im.width * scale)), max(1, int(im.height * scale))
+            if im.format == "JPEG":
+                im.draft("L" if grayscale else "RGB", (tw, th))
+            else:
+                factor = min(im.width // tw, im.height // th)
+                if factor >= 2:
+                    im = im.reduce(factor)
+    im = ImageOps.exif_transpose(im)  # EXIF回転反映
+    return im.convert("RGB")
 
 def render_page_to_pil(
     items: list[Item],
     pref: Optional[PageRef],
     dpi: int,
     grayscale: bool,
-    pdf_cache: Optional[Dict[str, fitz.Document]] = None,
+    pool: Optional[DocumentPool] = None,
+    budget: Optional[RenderBudget] = None,
+    fit_box: Optional[Tuple[int, int]] = None,
 ) -> Image.Image:
+    """budget を渡すとPDFページを帯ごとに描画し、中断と時間予算（dpiフォールバック）を効かせる。
+    fit_box（dpi換算の配置先ピクセルサイズ）を渡すと、PDFページは配置先でちょうど dpi になる縮尺で描画し、
+    画像アイテムはそれを下回らない範囲で縮小デコードする。"""
     if pref is None or pref.is_blank or pref.item_index < 0:
         im = blank_pil(dpi)
         return im.convert("L").convert("RGB") if grayscale else im
@@ -41,23 +167,12 @@ def render_page_to_pil(
     if it.kind == "blank":
         im = blank_pil(dpi)
     elif it.kind == "image":
-        im = Image.open(it.path)
-        im = ImageOps.exif_transpose(im)  # EXIF回転反映
-        im = im.convert("RGB")
+        im = _open_image(it.path, fit_box, grayscale)
     elif it.kind == "pdf":
-        if pdf_cache is not None:
-            doc = pdf_cache.get(it.path)
-            if doc is None:
-                doc = open_pdf_checked(it.path)
-                pdf_cache[it.path] = doc
-        else:
-            doc = open_pdf_checked(it.path)
-        page = doc.load_page(pref.pdf_page_index)
-        mat = fitz.Matrix(dpi / 72.0, dpi / 72.0)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
+        with _borrow_doc(pool, it.path) as doc:
+            page = doc.load_page(pref.pdf_page_index)
+            pix = _rasterize_pdf_page(page, dpi, budget, f"{it.display_name} p.{pref.pdf_page_index + 1}", fit_box)
         im = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-        if pdf_cache is None:
-            doc.close()
     else:
         im = blank_pil(dpi)
 
@@ -81,16 +196,21 @@ def render_spread_preview(
     spread: Spread,
     dpi: int = 110,
     grayscale: bool = False,
+    pool: Optional[DocumentPool] = None,
+    budget: Optional[RenderBudget] = None,
 ) -> Image.Image:
-    """右ペイン用：A4横キャンバス上に2-upしたプレビュー画像を生成"""
+    """右ペイン用：A4横キャンバス上に2-upしたプレビュー画像を生成。
+    pool を渡すとプレビュー更新をまたいで開いたPDFを使い回す。"""
     canvas = blank_pil(dpi)
     W, H = canvas.size
     half_w = W // 2
 
-    pdf_cache: Dict[str, fitz.Document] = {}
+    own_pool = pool is None
+    if own_pool:
+        pool = DocumentPool(max_open=2)
     try:
-        left = render_page_to_pil(items, spread.left, dpi=dpi, grayscale=grayscale, pdf_cache=pdf_cache)
-        right = render_page_to_pil(items, spread.right, dpi=dpi, grayscale=grayscale, pdf_cache=pdf_cache)
+        left = render_page_to_pil(items, spread.left, dpi=dpi, grayscale=grayscale, pool=pool, budget=budget, fit_box=(half_w, H))
+        right = render_page_to_pil(items, spread.right, dpi=dpi, grayscale=grayscale, pool=pool, budget=budget, fit_box=(half_w, H))
 
         lx, ly, lw, lh = fit_rect(left.width, left.height, half_w, H)
         canvas.paste(left.resize((lw, lh)), (lx, ly))
@@ -98,9 +218,62 @@ def render_spread_preview(
         rx, ry, rw, rh = fit_rect(right.width, right.height, half_w, H)
         canvas.paste(right.resize((rw, rh)), (half_w + rx, ry))
     finally:
-        for d in pdf_cache.values():
-            try:
-                d.close()
-            except Exception:
-                pass
+        if own_pool:
+            pool.close()
+    return canvas
+
+def _needs_pil_orientation(path: str) -> bool:
+    with Image.open(path) as im:
+        return im.format != "JPEG" and im.getexif().get(0x0112, 1) != 1
+
+def render_spread_preview_pixmap(
+    items: list[Item],
+    spread: Spread,
+    dpi: int = 110,
+    grayscale: bool = False,
+    pool: Optional[DocumentPool] = None,
+    budget: Optional[RenderBudget] = None,
+) -> fitz.Pixmap:
+    """render_spread_preview の Pillow を通さない版。
+
+    A4横キャンバス（fitz.Pixmap）を1枚用意し、各ページを配置サイズで直接描いてそこへ複写する。
+    画像アイテムも MuPDF の画像文書として開き、縮小描画時の間引きデコードは MuPDF に任せる。
+    ただし MuPDF は JPEG 以外の EXIF 回転を反映しないので、回転指定のある PNG 等は Pillow で開く。
+    グレースケール時は1chで返す。濃度を出力（Pillow の "L" 変換）と
+    揃えるため、変換だけは最後にキャンバス全体を Pillow で行う（MuPDF の変換はICC経由で濃淡が違う）。
+    """
+    W = int(A4_LANDSCAPE_IN[0] * dpi)
+    H = int(A4_LANDSCAPE_IN[1] * dpi)
+    canvas = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, W, H), False)
+    canvas.clear_with(255)
+    half_w = W // 2
+
+    own_pool = pool is None
+    if own_pool:
+        pool = DocumentPool(max_open=2)
+    try:
+        for pref, x0 in ((spread.left, 0), (spread.right, half_w)):
+            if pref is None or pref.is_blank or pref.item_index < 0:
+                continue
+            it = items[pref.item_index]
+            if it.kind not in ("pdf", "image"):
+                continue
+            if it.kind == "image" and _needs_pil_orientation(it.path):
+                im = _open_image(it.path, (half_w, H), grayscale=False)
+                _, _, w, h = fit_rect(im.width, im.height, half_w, H)
+                pix = fitz.Pixmap(fitz.csRGB, w, h, im.resize((w, h)).tobytes(), False)
+            else:
+                pno = pref.pdf_page_index or 0
+                with _borrow_doc(pool, it.path) as doc:
+                    page = doc.load_page(pno)
+                    pix = _rasterize_pdf_page(page, dpi, budget, f"{it.display_name} p.{pno + 1}", (half_w, H))
+            x, y, _, _ = fit_rect(pix.width, pix.height, half_w, H)
+            pix.set_origin(x0 + x, y)
+            canvas.copy(pix, pix.irect)
+    finally:
+        if own_pool:
+            pool.close()
+    if grayscale:
+        gray = Image.frombuffer("RGB", (W, H), canvas.samples_mv, "raw", "RGB", canvas.stride, 1).convert("L")
+        return fitz.Pixmap(fitz.csGRAY, W, H, gray.tobytes(), False)
     return canvas
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, Literal
+from typing import BinaryIO, Optional, Literal, Union
 
 ItemKind = Literal["pdf", "image", "blank"]
 Mode = Literal["booklet", "two_up"]
+# 出力先：ファイルパス、または書き込み可能なバイナリストリーム（stdout/パイプ等）
+OutputTarget = Union[str, BinaryIO]
 
 @dataclass
 class Item:
@@ -26,6 +28,22 @@ class Options:
     jpegq_normal: int = 92
     jpegq_compress: int = 85           # ← 高画質寄り
 
+    # 1ページのラスタライズ時間予算（秒）。超えたら dpi を下げて描き直す。0 で無制限
+    page_time_budget_s: float = 30.0
+    min_fallback_dpi: int = 72
+
+    # 生成パイプライン：描画・エンコードの各スレッド数と、同時に抱える片面ページ数の上限（メモリの上限）。
+    # PDFの描画（MuPDF）はGILを握ったままなので、描画スレッドを増やして速くなるのは画像入力だけ
+    render_threads: int = 1
+    encode_threads: int = 2
+    pipeline_depth: int = 8
+
+@dataclass
+class OutputVariant:
+    """1回の生成で書き出す出力の1つ（面付け・画質・色の組み合わせと出力先）"""
+    options: Options
+    output: OutputTarget
+
 @dataclass
 class PageRef:
     item_index: int
@@ -0,0 +1,211 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageOps
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt, Signal
+from PySide6.QtGui import QIcon, QImage, QPixmap
+
+from app.core.types import Item
+from app.gui.preview import pil_to_qimage, pixmap_to_qimage
+
+THUMB_PX = 48
+
+class ThumbnailLoader(QObject):
+    """サムネイルとメタ情報（ページ数・画素数）をバックグラウンドで読み込む。
+
+    要求は LIFO で処理し（いま見えている行ほど新しい要求）、max_pending を超えた
+    古い要求は捨てる。スクロールで見えなくなった行のために待たされない。
+    """
+    loaded = Signal(str, QImage, str)  # path, thumbnail, tooltip
+
+    def __init__(self, size: int = THUMB_PX, max_pending: int = 128):
+        super().__init__()
+        self.size = size
+        self.max_pending = max_pending
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._cv = threading.Condition()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="thumbnails", daemon=True)
+        self._thread.start()
+
+    def request(self, kind: str, path: str) -> None:
+        with self._cv:
+            if path in self._pending:
+                self._pending.move_to_end(path)
+            else:
+                self._pending[path] = kind
+                while len(self._pending) > self.max_pending:
+                    self._pending.popitem(last=False)
+            self._cv.notify()
+
+    def close(self) -> None:
+        with self._cv:
+            self._stop = True
+            self._pending.clear()
+            self._cv.notify()
+        self._thread.join(2.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while not self._pending and not self._stop:
+                    self._cv.wait()
+                if self._stop:
+                    return
+                path, kind = self._pending.popitem(last=True)
+            try:
+                qimg, tip = self._load(kind, path)
+            except Exception as e:
+                qimg, tip = QImage(), f"{path}\n読み込めません: {e}"
+            self.loaded.emit(path, qimg, tip)
+
+    def _load(self, kind: str, path: str) -> Tuple[QImage, str]:
+        box = (self.size, self.size)
+        if kind == "image":
+            with Image.open(path) as im:
+                fmt, (w, h) = im.format, im.size
+                im.draft("RGB", box)
+                thumb = ImageOps.exif_transpose(im)
+                thumb.thumbnail(box)
+                return pil_to_qimage(thumb), f"{path}\n{fmt} {w}×{h}"
+        doc = fitz.open(path)
+        try:
+            n = doc.page_count
+            if getattr(doc, "needs_pass", False) and doc.needs_pass:
+                return QImage(), f"{path}\nパスワード保護PDF"
+            page = doc.load_page(0)
+            z = self.size / max(page.rect.width, page.rect.height, 1)
+            pix = page.get_pixmap(matrix=fitz.Matrix(z, z), alpha=False)
+            return pixmap_to_qimage(pix), f"{path}\nPDF {n}ページ"
+        finally:
+            doc.close()
+
+class ItemListModel(QAbstractListModel):
+    """入力アイテム一覧のモデル。
+
+    挿入・削除・移動は begin/end*Rows で差分通知するので、数千件でも一覧全体を作り直さない。
+    サムネイルとツールチップはビューが実際に描く（＝見えている）行から遅延読み込みする。
+    """
+
+    def __init__(self, loader: Optional[ThumbnailLoader] = None, parent=None):
+        super().__init__(parent)
+        self._items: List[Item] = []
+        self._loader = loader
+        self._icons: Dict[str, QIcon] = {}
+        self._tips: Dict[str, str] = {}
+        if loader is not None:
+            loader.loaded.connect(self._on_loaded)
+
+    # --- 読み取り ---
+    def items(self) -> List[Item]:
+        return self._items
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._items)):
+            return None
+        it = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return "(空白)" if it.kind == "blank" else it.display_name
+        if it.kind == "blank" or not it.path:
+            return None
+        if role == Qt.ItemDataRole.DecorationRole:
+            icon = self._icons.get(it.path)
+            if icon is None and it.path not in self._tips:
+                self._request(it)
+            return icon
+        if role == Qt.ItemDataRole.ToolTipRole:
+            tip = self._tips.get(it.path)
+            if tip is None:
+                self._request(it)
+                return it.path
+            return tip
+        return None
+
+    # --- 編集（差分通知） ---
+    def insert_items(self, row: int, new_items: List[Item]) -> None:
+        if not new_items:
+            return
+        row = max(0, min(row, len(self._items)))
+        self.beginInsertRows(QModelIndex(), row, row + len(new_items) - 1)
+        self._items[row:row] = new_items
+        self.endInsertRows()
+
+    def remove_rows(self, rows: List[int]) -> None:
+        """任意の行集合を、連続区間ごとにまとめて後ろから削除する"""
+        for first, last in reversed(_runs(rows, len(self._items))):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._items[first:last + 1]
+            self.endRemoveRows()
+        self._prune_cache()
+
+    def move_rows(self, rows: List[int], delta: int) -> List[int]:
+        """選択行を1つ上(-1)/下(+1)へまとめて動かし、移動後の行番号を返す。
+        端に当たった区間はその場に留まる。"""
+        runs = _runs(rows, len(self._items))
+        moved: List[int] = []
+        if delta < 0:
+            for first, last in runs:
+                if first == 0:
+                    moved.extend(range(first, last + 1))
+                    continue
+                # 区間の直上の1行を区間の後ろへ
+                self.beginMoveRows(QModelIndex(), first - 1, first - 1, QModelIndex(), last + 1)
+                self._items.insert(last, self._items.pop(first - 1))
+                self.endMoveRows()
+                moved.extend(range(first - 1, last))
+        else:
+            for first, last in reversed(runs):
+                if last == len(self._items) - 1:
+                    moved.extend(range(first, last + 1))
+                    continue
+                # 区間の直下の1行を区間の前へ
+                self.beginMoveRows(QModelIndex(), last + 1, last + 1, QModelIndex(), first)
+                self._items.insert(first, self._items.pop(last + 1))
+                self.endMoveRows()
+                moved.extend(range(first + 1, last + 2))
+        return sorted(moved)
+
+    def sort_by_name(self) -> None:
+        self.beginResetModel()
+        self._items.sort(key=lambda it: it.display_name)
+        self.endResetModel()
+
+    # --- 遅延読み込み ---
+    def _request(self, it: Item) -> None:
+        # 重複はローダー側でまとめる。捨てられた要求も再描画時にまた来る
+        if self._loader is not None:
+            self._loader.request(it.kind, it.path)
+
+    def _prune_cache(self) -> None:
+        """一覧に残っていないパスのサムネイル・ツールチップを捨てる（追加し直せば読み直す）"""
+        live = {it.path for it in self._items}
+        for cache in (self._icons, self._tips):
+            for path in [p for p in cache if p not in live]:
+                del cache[path]
+
+    def _on_loaded(self, path: str, qimg: QImage, tip: str) -> None:
+        if not qimg.isNull():
+            self._icons[path] = QIcon(QPixmap.fromImage(qimg))
+        self._tips[path] = tip
+        if self._items:
+            # 見えていない行は再描画されないので全範囲通知で十分安い
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self._items) - 1),
+                [Qt.ItemDataRole.DecorationRole, Qt.ItemDataRole.ToolTipRole],
+            )
+
+def _runs(rows: List[int], n: int) -> List[Tuple[int, int]]:
+    """行番号の集合を昇順の連続区間 [(first, last), ...] にまとめる"""
+    out: List[Tuple[int, int]] = []
+    for r in sorted({r for r in rows if 0 <= r < n}):
+        if out and out[-1][1] == r - 1:
+            out[-1] = (out[-1][0], r)
+        else:
+            out.append((r, r))
+    return out
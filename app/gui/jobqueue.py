@@ -0,0 +1,255 @@
+from __future__ import annotations
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+from PySide6.QtWidgets import (
+    QHBoxLayout, QHeaderView, QLabel, QProgressBar, QPushButton, QSpinBox,
+    QTableWidget, QVBoxLayout, QWidget
+)
+
+from app.core.docpool import DocumentPool
+from app.gui.worker import Job, Worker
+
+QUEUED, RUNNING, DONE, FAILED, CANCELED = "待機", "実行中", "完了", "失敗", "中断"
+
+@dataclass
+class QueuedJob:
+    job_id: int
+    job: Job  # items/Options は投入時のスナップショット
+    status: str = QUEUED
+    current: int = 0
+    total: int = 0
+    started_at: float = 0.0
+    message: str = ""
+    slot: int = -1
+
+    @property
+    def eta_s(self) -> Optional[float]:
+        if self.status != RUNNING or self.current <= 0 or self.total <= 0:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return elapsed / self.current * (self.total - self.current)
+
+class JobQueue(QObject):
+    """生成ジョブの待ち行列。最大 max_concurrency 本を並行実行する。
+
+    実行枠（slot）ごとに DocumentPool を持ち、同じ枠で続けて走るジョブは開いたPDFと
+    ページ数キャッシュを使い回す。1つの文書を複数スレッドで同時に触らないよう、
+    プールは枠をまたいで共有しない。
+    """
+    changed = Signal(int)          # job_id
+    log = Signal(int, str)         # job_id, message
+    job_finished = Signal(int)     # job_id（完了・失敗・中断のいずれか）
+    idle = Signal()                # 実行中・待機中がなくなった
+
+    def __init__(self, max_concurrency: int = 2, parent=None):
+        super().__init__(parent)
+        self.max_concurrency = max(1, max_concurrency)
+        self.jobs: List[QueuedJob] = []
+        self._next_id = 1
+        self._pools: Dict[int, DocumentPool] = {}
+        self._running: Dict[int, tuple[QThread, Worker]] = {}
+        self._by_worker: Dict[QObject, int] = {}
+
+    def enqueue(self, job: Job) -> int:
+        qj = QueuedJob(job_id=self._next_id, job=job)
+        self._next_id += 1
+        self.jobs.append(qj)
+        self.changed.emit(qj.job_id)
+        self._pump()
+        return qj.job_id
+
+    def set_max_concurrency(self, n: int) -> None:
+        self.max_concurrency = max(1, n)
+        self._pump()
+
+    def get(self, job_id: int) -> Optional[QueuedJob]:
+        for qj in self.jobs:
+            if qj.job_id == job_id:
+                return qj
+        return None
+
+    def active(self) -> List[QueuedJob]:
+        return [qj for qj in self.jobs if qj.status in (QUEUED, RUNNING)]
+
+    def cancel(self, job_id: int) -> None:
+        qj = self.get(job_id)
+        if qj is None:
+            return
+        if qj.status == QUEUED:
+            qj.status = CANCELED
+            qj.message = "中断しました。"
+            self.changed.emit(job_id)
+            self.job_finished.emit(job_id)
+            self._check_idle()
+        elif qj.status == RUNNING and job_id in self._running:
+            self._running[job_id][1].cancel()
+
+    def cancel_all(self) -> None:
+        for qj in self.active():
+            self.cancel(qj.job_id)
+
+    def close(self) -> None:
+        self.cancel_all()
+        busy = set()
+        for job_id, (thread, _) in list(self._running.items()):
+            thread.quit()
+            if not thread.wait(5000):
+                # 保存中などで止まりきらなかったジョブの文書は閉じない（終了時に使用中の文書を壊さない）
+                qj = self.get(job_id)
+                if qj is not None:
+                    busy.add(qj.slot)
+        for slot, pool in self._pools.items():
+            if slot not in busy:
+                pool.close()
+
+    def _free_slot(self) -> int:
+        used = {qj.slot for qj in self.jobs if qj.status == RUNNING}
+        slot = 0
+        while slot in used:
+            slot += 1
+        return slot
+
+    def _pump(self) -> None:
+        for qj in self.jobs:
+            if len(self._running) >= self.max_concurrency:
+                return
+            if qj.status == QUEUED:
+                self._start(qj)
+
+    def _start(self, qj: QueuedJob) -> None:
+        qj.slot = self._free_slot()
+        pool = self._pools.setdefault(qj.slot, DocumentPool())
+        qj.status = RUNNING
+        qj.started_at = time.monotonic()
+
+        thread = QThread(self)
+        worker = Worker(qj.job, pool=pool)
+        worker.moveToThread(thread)
+        self._running[qj.job_id] = (thread, worker)
+        jid = qj.job_id
+
+        # ワーカーのシグナルは自分のスロットで受け（GUIスレッドへキューイング）、sender() でジョブを引く
+        self._by_worker[worker] = jid
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_progress)
+        worker.log.connect(self._on_log)
+        worker.finished.connect(self._on_finished)
+        worker.failed.connect(self._on_failed)
+        worker.canceled.connect(self._on_canceled)
+        thread.start()
+        self.changed.emit(jid)
+
+    @Slot(int, int)
+    def _on_progress(self, cur: int, total: int) -> None:
+        qj = self.get(self._by_worker.get(self.sender(), -1))
+        if qj is not None:
+            qj.current, qj.total = cur, total
+            self.changed.emit(qj.job_id)
+
+    @Slot(str)
+    def _on_log(self, msg: str) -> None:
+        self.log.emit(self._by_worker.get(self.sender(), -1), msg)
+
+    @Slot(str)
+    def _on_finished(self, _out: str) -> None:
+        self._on_done(self.sender(), DONE, "")
+
+    @Slot(str)
+    def _on_failed(self, msg: str) -> None:
+        self._on_done(self.sender(), FAILED, msg)
+
+    @Slot(str)
+    def _on_canceled(self, msg: str) -> None:
+        self._on_done(self.sender(), CANCELED, msg)
+
+    def _on_done(self, worker: QObject, status: str, msg: str) -> None:
+        job_id = self._by_worker.pop(worker, -1)
+        if job_id not in self._running:
+            return
+        qj = self.get(job_id)
+        thread, _ = self._running.pop(job_id)
+        thread.quit()
+        thread.wait(2000)
+        thread.deleteLater()
+        if qj is not None:
+            qj.status = status
+            qj.message = msg
+            self.changed.emit(job_id)
+            self.job_finished.emit(job_id)
+        self._pump()
+        self._check_idle()
+
+    def _check_idle(self) -> None:
+        if not self.active():
+            self.idle.emit()
+
+def _fmt_eta(sec: Optional[float]) -> str:
+    if sec is None:
+        return ""
+    sec = int(sec + 0.5)
+    return f"残り {sec // 60}:{sec % 60:02d}"
+
+class JobQueuePanel(QWidget):
+    """ジョブ一覧（出力先・状態・進捗・残り時間・中断ボタン）と同時実行数の設定"""
+    COLS = ["出力", "状態", "進捗", "残り", ""]
+
+    def __init__(self, queue: JobQueue, parent=None):
+        super().__init__(parent)
+        self.queue = queue
+        self._rows: Dict[int, int] = {}
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        head = QHBoxLayout()
+        head.addWidget(QLabel("ジョブ"))
+        head.addStretch(1)
+        head.addWidget(QLabel("同時実行数"))
+        self.spin = QSpinBox()
+        self.spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.spin.setValue(queue.max_concurrency)
+        self.spin.valueChanged.connect(queue.set_max_concurrency)
+        head.addWidget(self.spin)
+        layout.addLayout(head)
+
+        self.table = QTableWidget(0, len(self.COLS))
+        self.table.setHorizontalHeaderLabels(self.COLS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setMaximumHeight(140)
+        layout.addWidget(self.table)
+
+        queue.changed.connect(self._update_row)
+
+    def _update_row(self, job_id: int) -> None:
+        qj = self.queue.get(job_id)
+        if qj is None:
+            return
+        row = self._rows.get(job_id)
+        if row is None:
+            row = self.table.rowCount()
+            self._rows[job_id] = row
+            self.table.insertRow(row)
+            self.table.setCellWidget(row, 0, QLabel(os.path.basename(qj.job.output_pdf)))
+            self.table.cellWidget(row, 0).setToolTip(qj.job.output_pdf)
+            self.table.setCellWidget(row, 1, QLabel())
+            self.table.setCellWidget(row, 2, QProgressBar())
+            self.table.setCellWidget(row, 3, QLabel())
+            btn = QPushButton("中断")
+            btn.clicked.connect(lambda: self.queue.cancel(job_id))
+            self.table.setCellWidget(row, 4, btn)
+            self.table.scrollToBottom()
+
+        status = self.table.cellWidget(row, 1)
+        status.setText(qj.status)
+        status.setToolTip(qj.message)
+        bar: QProgressBar = self.table.cellWidget(row, 2)
+        bar.setMaximum(max(1, qj.total))
+        bar.setValue(qj.total if qj.status == DONE else qj.current)
+        self.table.cellWidget(row, 3).setText(_fmt_eta(qj.eta_s))
+        self.table.cellWidget(row, 4).setEnabled(qj.status in (QUEUED, RUNNING))
@@ -2,7 +2,7 @@ from __future__ import annotations
 import os
 from typing import List
 
-from PySide6.QtCore import Qt, QSettings, QThread
+from PySide6.QtCore import Qt, QSettings, QThread, QTimer, QItemSelection, QItemSelectionModel, Signal
 from PySide6.QtGui import QPixmap, QImage, QIcon
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QPushButton,
@@ -13,28 +13,27 @@ from PySide6.QtWidgets import (
 
 from app.core.types import Item, Options
 from app.core.errors import UserFacingError, is_heic, is_supported_image, is_pdf
+from app.core.docpool import DocumentPool
 from app.core.engine import build_logical_pages, validate_and_build_items
 from app.core.plan import make_preview_spreads
-from app.core.render import render_spread_preview
 
 # 解決：相対importを絶対importに変更
-# from .widgets import DropListWidget
+# from .widgets import DropListView
 # from .worker import Worker, Job
-from app.gui.widgets import DropListWidget
-from app.gui.worker import Worker, Job
+from app.gui.widgets import DropListView
+from app.gui.itemmodel import ItemListModel, ThumbnailLoader
+from app.gui.worker import Job
+from app.gui.jobqueue import CANCELED, DONE, FAILED, JobQueue, JobQueuePanel
+from app.gui.preview import PreviewRenderer, preview_dpi_for
 
 APP_TITLE = "PDF2Booklet"
 ORG_NAME = "PDF2Booklet"
 APP_NAME = "PDF2Booklet"
 
-def pil_to_qpixmap(pil_img) -> QPixmap:
-    rgb = pil_img.convert("RGB")
-    w, h = rgb.size
-    data = rgb.tobytes("raw", "RGB")
-    qimg = QImage(data, w, h, QImage.Format.Format_RGB888)
-    return QPixmap.fromImage(qimg)
-
 class MainWindow(QMainWindow):
+    # (seq, items, spread, dpi, grayscale) → PreviewRenderer.render
+    preview_requested = Signal(int, object, object, int, bool)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle(APP_TITLE)
@@ -45,18 +44,47 @@ class MainWindow(QMainWindow):
             self.setWindowIcon(QIcon(icon_path))
 
         self.settings = QSettings(ORG_NAME, APP_NAME)
-        self.items: List[Item] = []
+        # 入力一覧はモデルが持つ（差分更新・サムネイル遅延読み込み）
+        self.thumb_loader = ThumbnailLoader()
+        self.item_model = ItemListModel(self.thumb_loader, self)
         self.preview_spreads = []
         self.last_output_pdf = ""
-
-        self._thread: QThread | None = None
-        self._worker: Worker | None = None
+        # 論理ページ組み立て（build_logical_pages）でPDFのページ数を数えるときに開いたPDFを使い回す（GUIスレッド専用）
+        self.doc_pool = DocumentPool(max_open=16)
+
+        # 生成ジョブの待ち行列（複数ジョブを並行実行）
+        self.job_queue = JobQueue(max_concurrency=2, parent=self)
+        self.job_queue.changed.connect(lambda _: self._update_total_progress())
+        self.job_queue.log.connect(lambda jid, m: self._append_log(f"[JOB#{jid}] {m}"))
+        self.job_queue.job_finished.connect(self.on_job_done)
+        self.job_queue.idle.connect(self.on_queue_idle)
+        # 前回キューが空になってから完了したジョブ数（完了通知を出すかどうか）
+        self._done_since_idle = 0
+
+        # プレビュー描画用スレッド（粗い版・仕上げ版とも。GUIスレッドではラスタライズしない）
+        self._preview_seq = 0
+        self._preview_thread = QThread(self)
+        self._preview_renderer = PreviewRenderer()
+        self._preview_renderer.moveToThread(self._preview_thread)
+        self.preview_requested.connect(self._preview_renderer.render)
+        self._preview_renderer.rendered.connect(self.on_preview_rendered)
+        self._preview_renderer.failed.connect(self.on_preview_failed)
+        self._preview_thread.start()
+
+        # 連続した編集はまとめて1回だけプレビューを作り直す
+        self._rebuild_timer = QTimer(self)
+        self._rebuild_timer.setSingleShot(True)
+        self._rebuild_timer.setInterval(80)
+        self._rebuild_timer.timeout.connect(self._rebuild_preview)
 
         self._build_ui()
         self._load_settings()
-        self._refresh_list()
         self._rebuild_preview()
 
+    @property
+    def items(self) -> List[Item]:
+        return self.item_model.items()
+
     def _build_ui(self):
         root = QWidget()
         self.setCentralWidget(root)
@@ -69,7 +97,8 @@ class MainWindow(QMainWindow):
         left = QWidget()
         left_layout = QVBoxLayout(left)
 
-        self.listw = DropListWidget()
+        self.listw = DropListView()
+        self.listw.setModel(self.item_model)
         self.listw.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.listw.files_dropped.connect(self.on_files_dropped)
         left_layout.addWidget(self.listw, stretch=1)
@@ -163,7 +192,7 @@ class MainWindow(QMainWindow):
 
         action_row = QHBoxLayout()
         self.btn_generate = QPushButton("PDF生成…")
-        self.btn_cancel = QPushButton("中断")
+        self.btn_cancel = QPushButton("すべて中断")
         self.btn_open_folder = QPushButton("保存先を開く")
         self.btn_open_folder.setEnabled(False)
         action_row.addWidget(self.btn_generate)
@@ -172,6 +201,9 @@ class MainWindow(QMainWindow):
         action_row.addStretch(1)
         bottom_layout.addLayout(action_row)
 
+        self.queue_panel = JobQueuePanel(self.job_queue)
+        bottom_layout.addWidget(self.queue_panel)
+
         self.pbar = QProgressBar()
         self.pbar.setValue(0)
         bottom_layout.addWidget(self.pbar)
@@ -208,12 +240,28 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self._save_settings()
+        self.job_queue.close()
+        self._preview_renderer.latest = -1
+        self._preview_thread.quit()
+        self._preview_thread.wait(2000)
+        self._preview_renderer.close()
+        self.thumb_loader.close()
+        self.doc_pool.close()
         super().closeEvent(event)
 
-    def _refresh_list(self):
-        self.listw.clear()
-        for it in self.items:
-            self.listw.addItem("(空白)" if it.kind == "blank" else it.display_name)
+    def _schedule_rebuild(self):
+        self._rebuild_timer.start()
+
+    def _select_rows(self, rows: List[int]):
+        sel = QItemSelection()
+        for r in rows:
+            idx = self.item_model.index(r)
+            sel.select(idx, idx)
+        sm = self.listw.selectionModel()
+        sm.select(sel, QItemSelectionModel.SelectionFlag.ClearAndSelect)
+        if rows:
+            sm.setCurrentIndex(self.item_model.index(rows[0]), QItemSelectionModel.SelectionFlag.NoUpdate)
+            self.listw.scrollTo(self.item_model.index(rows[0]))
 
     def _append_log(self, msg: str):
         self.log.appendPlainText(msg)
@@ -249,10 +297,8 @@ class MainWindow(QMainWindow):
             self._error("追加できません", str(e))
             return
 
-        insert_row = max(0, min(insert_row, len(self.items)))
-        self.items[insert_row:insert_row] = new_items
-        self._refresh_list()
-        self._rebuild_preview()
+        self.item_model.insert_items(insert_row, new_items)
+        self._schedule_rebuild()
 
     def on_add_clicked(self):
         paths, _ = QFileDialog.getOpenFileNames(
@@ -267,46 +313,34 @@ class MainWindow(QMainWindow):
         except UserFacingError as e:
             self._error("追加できません", str(e))
             return
-        self.items.extend(new_items)
-        self._refresh_list()
-        self._rebuild_preview()
+        self.item_model.insert_items(len(self.items), new_items)
+        self._schedule_rebuild()
 
     def on_delete_clicked(self):
-        rows = sorted({i.row() for i in self.listw.selectedIndexes()}, reverse=True)
-        for r in rows:
-            if 0 <= r < len(self.items):
-                self.items.pop(r)
-        self._refresh_list()
-        self._rebuild_preview()
+        self.item_model.remove_rows(self.listw.selected_rows())
+        self._schedule_rebuild()
 
     def on_move(self, delta: int):
-        rows = sorted({i.row() for i in self.listw.selectedIndexes()})
-        if len(rows) != 1:
-            self._warn("移動", "移動は1件選択のときに使用してください。")
-            return
-        r = rows[0]
-        nr = r + delta
-        if not (0 <= nr < len(self.items)):
+        rows = self.listw.selected_rows()
+        if not rows:
             return
-        self.items[r], self.items[nr] = self.items[nr], self.items[r]
-        self._refresh_list()
-        self.listw.setCurrentRow(nr)
-        self._rebuild_preview()
+        new_rows = self.item_model.move_rows(rows, delta)
+        self._select_rows(new_rows)
+        if new_rows != rows:
+            self._schedule_rebuild()
 
     def on_sort_clicked(self):
-        self.items.sort(key=lambda it: it.display_name)
-        self._refresh_list()
-        self._rebuild_preview()
+        self.item_model.sort_by_name()
+        self._schedule_rebuild()
 
     def on_insert_blank(self):
-        rows = sorted({i.row() for i in self.listw.selectedIndexes()})
+        rows = self.listw.selected_rows()
         if len(rows) != 1:
             self._warn("空白挿入", "空白挿入は1件選択のときに使用してください。")
             return
         r = rows[0]
-        self.items.insert(r + 1, Item(kind="blank", path=None, display_name="(空白)"))
-        self._refresh_list()
-        self._rebuild_preview()
+        self.item_model.insert_items(r + 1, [Item(kind="blank", path=None, display_name="(空白)")])
+        self._schedule_rebuild()
 
     def on_mode_changed(self):
         self.lbl_cover_note.setVisible(self.rb_booklet.isChecked())
@@ -314,9 +348,10 @@ class MainWindow(QMainWindow):
     def _rebuild_preview(self):
         self.preview_spreads = []
         try:
-            pages = build_logical_pages(self.items)
+            pages = build_logical_pages(self.items, self.doc_pool)
             self.preview_spreads = make_preview_spreads(pages, self.cb_cover.isChecked())
         except UserFacingError as e:
+            self._cancel_preview_refine()
             self.preview_label.setText("プレビュー生成エラー")
             self._append_log(f"[ERROR] {e}")
             self.slider.setMaximum(0)
@@ -325,6 +360,7 @@ class MainWindow(QMainWindow):
 
         total = len(self.preview_spreads)
         if total == 0:
+            self._cancel_preview_refine()
             self.slider.setMaximum(0)
             self.slider.setValue(0)
             self.lbl_spread.setText("見開き 0 / 0")
@@ -342,7 +378,12 @@ class MainWindow(QMainWindow):
     def on_slider_changed(self, v: int):
         self._render_preview(v)
 
+    def _cancel_preview_refine(self):
+        self._preview_seq += 1
+        self._preview_renderer.latest = self._preview_seq
+
     def _render_preview(self, index: int):
+        self._cancel_preview_refine()
         total = len(self.preview_spreads)
         if total == 0:
             self.preview_label.setText("プレビューなし")
@@ -350,17 +391,33 @@ class MainWindow(QMainWindow):
             return
         index = max(0, min(index, total - 1))
         self.lbl_spread.setText(f"見開き {index + 1} / {total}")
-        try:
-            pil = render_spread_preview(self.items, self.preview_spreads[index], dpi=110, grayscale=self.cb_gray.isChecked())
-            pix = pil_to_qpixmap(pil)
-            self.preview_label.setPixmap(pix.scaled(
-                self.preview_label.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            ))
-        except UserFacingError as e:
+        spread = self.preview_spreads[index]
+        grayscale = self.cb_gray.isChecked()
+
+        # 描画はすべて別スレッド（粗い版 → 表示サイズ×デバイスピクセル比の仕上げ版）。
+        # 届くまでは直前の画像をそのまま出しておき、GUIスレッドではラスタライズしない
+        dpr = self.preview_label.devicePixelRatioF()
+        dpi = preview_dpi_for(self.preview_label.width() * dpr, self.preview_label.height() * dpr)
+        self.preview_requested.emit(self._preview_seq, list(self.items), spread, dpi, grayscale)
+
+    def on_preview_rendered(self, seq: int, qimg: QImage):
+        if seq == self._preview_seq:
+            self._show_preview(qimg)
+
+    def on_preview_failed(self, seq: int, msg: str):
+        if seq == self._preview_seq:
             self.preview_label.setText("プレビュー生成エラー")
-            self._append_log(f"[ERROR] {e}")
+            self._append_log(f"[ERROR] {msg}")
+
+    def _show_preview(self, qimg: QImage):
+        dpr = self.preview_label.devicePixelRatioF()
+        pix = QPixmap.fromImage(qimg).scaled(
+            self.preview_label.size() * dpr,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        pix.setDevicePixelRatio(dpr)
+        self.preview_label.setPixmap(pix)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -381,6 +438,9 @@ class MainWindow(QMainWindow):
             out_path += ".pdf"
 
         self._last_output_dir = os.path.dirname(out_path)
+        if any(os.path.abspath(qj.job.output_pdf) == os.path.abspath(out_path) for qj in self.job_queue.active()):
+            self._warn("生成", "同じ出力先のジョブが実行中（待機中）です。")
+            return
 
         mode = "booklet" if self.rb_booklet.isChecked() else "two_up"
         cover_for_output = self.cb_cover.isChecked() if mode == "two_up" else False
@@ -392,61 +452,45 @@ class MainWindow(QMainWindow):
             compress=self.cb_comp.isChecked(),
         )
 
-        self.pbar.setValue(0)
-        self.btn_generate.setEnabled(False)
-        self.btn_open_folder.setEnabled(False)
-        self._append_log(f"[INFO] 生成開始: mode={mode}, grayscale={opts.grayscale}, compress={opts.compress}")
-
+        self._append_log(f"[INFO] 生成ジョブ追加: {out_path} mode={mode}, grayscale={opts.grayscale}, compress={opts.compress}")
+        # items/Options はこの時点のスナップショット（後で一覧を編集しても影響しない）
         job = Job(items=list(self.items), options=opts, output_pdf=out_path)
-        self._thread = QThread(self)
-        self._worker = Worker(job)
-        self._worker.moveToThread(self._thread)
-
-        self._thread.started.connect(self._worker.run)
-        self._worker.progress.connect(self.on_job_progress)
-        self._worker.log.connect(lambda m: self._append_log(f"[JOB] {m}"))
-        self._worker.finished.connect(self.on_job_finished)
-        self._worker.failed.connect(self.on_job_failed)
-        self._worker.canceled.connect(self.on_job_canceled)
-
-        def cleanup():
-            if self._thread:
-                self._thread.quit()
-                self._thread.wait(2000)
-            self._thread = None
-            self._worker = None
-            self.btn_generate.setEnabled(True)
-
-        self._worker.finished.connect(lambda _: cleanup())
-        self._worker.failed.connect(lambda _: cleanup())
-        self._worker.canceled.connect(lambda _: cleanup())
-
-        self._thread.start()
-
-    def on_job_progress(self, cur: int, total: int):
+        self.job_queue.enqueue(job)
+
+    def _update_total_progress(self):
+        """待機中・実行中ジョブ全体の進捗"""
+        active = self.job_queue.active()
+        total = sum(max(qj.total, 1) for qj in active)
         if total <= 0:
-            self.pbar.setValue(0)
             return
         self.pbar.setMaximum(total)
-        self.pbar.setValue(cur)
-
-    def on_job_finished(self, out_path: str):
-        self._append_log(f"[INFO] 生成完了: {out_path}")
-        self.last_output_pdf = out_path
-        self.btn_open_folder.setEnabled(True)
-        QMessageBox.information(self, "完了", "PDF生成が完了しました。")
+        self.pbar.setValue(sum(qj.current for qj in active))
 
-    def on_job_failed(self, msg: str):
-        self._error("生成エラー", msg)
-
-    def on_job_canceled(self, msg: str):
-        self._append_log(f"[INFO] {msg}")
-        QMessageBox.information(self, "中断", msg)
+    def on_job_done(self, job_id: int):
+        qj = self.job_queue.get(job_id)
+        if qj is None:
+            return
+        if qj.status == DONE:
+            self._done_since_idle += 1
+            self._append_log(f"[INFO] 生成完了: {qj.job.output_pdf}")
+            self.last_output_pdf = qj.job.output_pdf
+            self.btn_open_folder.setEnabled(True)
+        elif qj.status == FAILED:
+            self._error("生成エラー", f"{os.path.basename(qj.job.output_pdf)}: {qj.message}")
+        elif qj.status == CANCELED:
+            self._append_log(f"[INFO] {os.path.basename(qj.job.output_pdf)}: {qj.message}")
+
+    def on_queue_idle(self):
+        self.pbar.setMaximum(1)
+        self.pbar.setValue(1)
+        done, self._done_since_idle = self._done_since_idle, 0
+        if done:
+            QMessageBox.information(self, "完了", "キュー内のPDF生成が終わりました。")
 
     def on_cancel_clicked(self):
-        if self._worker:
-            self._append_log("[INFO] 中断要求")
-            self._worker.cancel()
+        if self.job_queue.active():
+            self._append_log("[INFO] 中断要求（すべてのジョブ）")
+            self.job_queue.cancel_all()
 
     def on_open_folder_clicked(self):
         if not self.last_output_pdf:
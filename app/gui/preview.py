@@ -0,0 +1,62 @@
+from __future__ import annotations
+from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtGui import QImage
+
+from app.core.docpool import DocumentPool
+from app.core.errors import JobCanceled, UserFacingError
+from app.core.render import A4_LANDSCAPE_IN, RenderBudget, render_spread_preview_pixmap
+
+# 先に即表示する粗いプレビューの解像度と、仕上げ描画の上限
+PREVIEW_LOW_DPI = 20
+PREVIEW_MAX_DPI = 220
+
+def pil_to_qimage(pil_img) -> QImage:
+    rgb = pil_img.convert("RGB")
+    w, h = rgb.size
+    data = rgb.tobytes("raw", "RGB")
+    # data の寿命に依存しないよう copy() で所有させる
+    return QImage(data, w, h, 3 * w, QImage.Format.Format_RGB888).copy()
+
+def pixmap_to_qimage(pix) -> QImage:
+    """fitz.Pixmap（RGB/グレー、αなし）→ QImage。サンプルは memoryview のまま渡し、複写は1回だけ"""
+    fmt = QImage.Format.Format_Grayscale8 if pix.n == 1 else QImage.Format.Format_RGB888
+    return QImage(pix.samples_mv, pix.width, pix.height, pix.stride, fmt).copy()
+
+def preview_dpi_for(width_px: float, height_px: float) -> int:
+    """表示先の実ピクセルサイズにA4横がちょうど収まるdpi"""
+    dpi = min(width_px / A4_LANDSCAPE_IN[0], height_px / A4_LANDSCAPE_IN[1])
+    return int(max(PREVIEW_LOW_DPI, min(PREVIEW_MAX_DPI, dpi)))
+
+class PreviewRenderer(QObject):
+    """プレビューを別スレッドで描画する。1要求につき粗い版（PREVIEW_LOW_DPI）→ 仕上げ版の順に送る。
+
+    粗い版でもページ内の全パスを解釈するので、複雑なページではGUIスレッドで描くと固まる。
+    request ごとに連番 seq を振り、latest と異なる（ユーザーが別の見開きへ移った）要求は
+    描画前・描画中（帯ごと）に打ち切る。PDFはこのスレッド専用のプールから開く。
+    """
+    rendered = Signal(int, QImage)
+    failed = Signal(int, str)
+
+    def __init__(self):
+        super().__init__()
+        self.latest = 0
+        self.pool = DocumentPool(max_open=8)
+
+    @Slot(int, object, object, int, bool)
+    def render(self, seq: int, items, spread, dpi: int, grayscale: bool):
+        if seq != self.latest:
+            return
+        budget = RenderBudget(tiles=4, cancel_cb=lambda: seq != self.latest)
+        try:
+            for d in (PREVIEW_LOW_DPI, dpi) if dpi > PREVIEW_LOW_DPI else (PREVIEW_LOW_DPI,):
+                pix = render_spread_preview_pixmap(items, spread, dpi=d, grayscale=grayscale, pool=self.pool, budget=budget)
+                if seq != self.latest:
+                    return
+                self.rendered.emit(seq, pixmap_to_qimage(pix))
+        except JobCanceled:
+            return
+        except UserFacingError as e:
+            self.failed.emit(seq, str(e))
+
+    def close(self):
+        self.pool.close()
@@ -1,16 +1,21 @@
 from __future__ import annotations
 import os
 from PySide6.QtCore import Signal
-from PySide6.QtWidgets import QListWidget
+from PySide6.QtWidgets import QListView
 from PySide6.QtGui import QDropEvent
 
-class DropListWidget(QListWidget):
+class DropListView(QListView):
     """外部からのファイルD&Dを受け取り、(paths, insert_index) を通知する。"""
     files_dropped = Signal(list, int)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
+        # 行の高さを固定にして見えている行だけを問い合わせさせ、
+        # 行の再配置も小分けにしてイベントループを止めない（数千件向け）
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
@@ -31,7 +36,7 @@ class DropListWidget(QListWidget):
         pos = event.position().toPoint()
         row = self.indexAt(pos).row()
         if row < 0:
-            row = self.count()  # append
+            row = self.model().rowCount() if self.model() else 0  # append
 
         paths = []
         for u in event.mimeData().urls():
@@ -41,3 +46,6 @@ class DropListWidget(QListWidget):
 
         self.files_dropped.emit(paths, row)
         event.acceptProposedAction()
+
+    def selected_rows(self) -> list[int]:
+        return sorted(i.row() for i in self.selectionModel().selectedRows())
@@ -3,8 +3,9 @@ from dataclasses import dataclass
 from PySide6.QtCore import QObject, Signal, Slot
 
 from app.core.types import Item, Options
+from app.core.docpool import DocumentPool
 from app.core.engine import generate_pdf
-from app.core.errors import UserFacingError
+from app.core.errors import JobCanceled, UserFacingError
 
 @dataclass
 class Job:
@@ -19,9 +20,10 @@ class Worker(QObject):
     failed = Signal(str)
     canceled = Signal(str)
 
-    def __init__(self, job: Job):
+    def __init__(self, job: Job, pool: DocumentPool | None = None):
         super().__init__()
         self.job = job
+        self.pool = pool
         self._cancel = False
 
     @Slot()
@@ -43,13 +45,13 @@ class Worker(QObject):
                 progress_cb=progress_cb,
                 cancel_cb=cancel_cb,
                 log_cb=log_cb,
+                pool=self.pool,
             )
             self.finished.emit(self.job.output_pdf)
+        except JobCanceled as e:
+            self.canceled.emit(str(e))
         except UserFacingError as e:
-            if str(e).strip() == "中断しました。":
-                self.canceled.emit("中断しました。")
-            else:
-                self.failed.emit(str(e))
+            self.failed.emit(str(e))
         except Exception as e:
             self.failed.emit(f"不明なエラー: {e}")
 
@@ -0,0 +1,65 @@
+"""入力一覧のストレステスト（既定 10,000 件）
+
+    python scripts/bench_itemlist.py [--items 10000] > bench_output.txt
+
+ItemListModel + DropListView の差分更新と、従来方式（QListWidget を毎回 clear して
+全件追加）の所要時間を比べる。画面は不要（offscreen）。
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QListWidget  # noqa: E402
+from app.core.types import Item  # noqa: E402
+from app.gui.itemmodel import ItemListModel  # noqa: E402
+from app.gui.widgets import DropListView  # noqa: E402
+
+def _items(n: int, prefix: str = "img") -> list[Item]:
+    return [Item(kind="image", path=f"/nonexistent/{prefix}{i:05d}.jpg", display_name=f"{prefix}{i:05d}.jpg") for i in range(n)]
+
+def _timed(label: str, fn) -> None:
+    t0 = time.perf_counter()
+    fn()
+    QApplication.processEvents()
+    print(f"{label:<28} {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=10_000)
+    args = ap.parse_args()
+    n = args.items
+    app = QApplication.instance() or QApplication([])
+
+    print(f"# model/view ({n} 件)")
+    model = ItemListModel()
+    view = DropListView()
+    view.setModel(model)
+    view.resize(400, 600)
+    view.show()
+    _timed("insert all", lambda: model.insert_items(0, _items(n)))
+    _timed("insert 1 (middle)", lambda: model.insert_items(n // 2, _items(1, "x")))
+    _timed("remove 100 scattered", lambda: model.remove_rows(list(range(0, n, n // 100))))
+    _timed("move 500 rows up", lambda: model.move_rows(list(range(1, 1000, 2)), -1))
+    _timed("move 1000 contiguous down", lambda: model.move_rows(list(range(2000, 3000)), +1))
+    _timed("sort by name", model.sort_by_name)
+
+    print(f"# 従来方式: QListWidget 全件作り直し ({n} 件)")
+    items = _items(n)
+    lw = QListWidget()
+    lw.resize(400, 600)
+    lw.show()
+
+    def refill():
+        lw.clear()
+        for it in items:
+            lw.addItem(it.display_name)
+    _timed("refill (1 edit)", refill)
+    del app
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""見開きプレビュー描画のベンチマーク
+
+    python scripts/bench_preview.py [--dpi 110] [--repeat 5] > bench_output.txt
+
+PDF / JPEG / PNG の見開きについて、
+- PIL 経由: render_spread_preview → pil_to_qimage
+- Pixmap 直: render_spread_preview_pixmap → pixmap_to_qimage
+の所要時間（中央値）を比べる。画面は不要。
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import fitz  # noqa: E402
+from PIL import Image  # noqa: E402
+from app.core.docpool import DocumentPool  # noqa: E402
+from app.core.render import render_spread_preview, render_spread_preview_pixmap  # noqa: E402
+from app.core.types import Item, PageRef, Spread  # noqa: E402
+from app.gui.preview import pil_to_qimage, pixmap_to_qimage  # noqa: E402
+
+def make_inputs(td: str) -> dict[str, list[Item]]:
+    pdf = os.path.join(td, "v.pdf")
+    doc = fitz.open()
+    for p in range(2):
+        page = doc.new_page(width=595, height=842)
+        for x in range(0, 595, 8):
+            page.draw_line((x, 0), (595 - x, 842), color=(0, 0, 0.6), width=0.5)
+        page.insert_text((36, 72), f"page {p + 1}", fontsize=48)
+    doc.save(pdf)
+    doc.close()
+
+    im = Image.radial_gradient("L").resize((4000, 3000)).convert("RGB")
+    jpg = os.path.join(td, "big.jpg")
+    png = os.path.join(td, "big.png")
+    im.save(jpg, quality=90)
+    im.save(png)
+    return {
+        "pdf": [Item(kind="pdf", path=pdf, display_name="v.pdf")],
+        "jpeg": [Item(kind="image", path=jpg, display_name="big.jpg")] * 2,
+        "png": [Item(kind="image", path=png, display_name="big.png")] * 2,
+    }
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dpi", type=int, default=110)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td, DocumentPool() as pool:
+        print(f"# 見開きプレビュー dpi={args.dpi}（中央値, {args.repeat} 回）")
+        print(f"{'input':>6} {'PIL':>9} {'pixmap':>9}")
+        for name, items in make_inputs(td).items():
+            if name == "pdf":
+                spread = Spread(left=PageRef(0, 0), right=PageRef(0, 1))
+            else:
+                spread = Spread(left=PageRef(0), right=PageRef(1))
+            old = _median_ms(lambda: pil_to_qimage(render_spread_preview(items, spread, dpi=args.dpi, pool=pool)), args.repeat)
+            new = _median_ms(lambda: pixmap_to_qimage(render_spread_preview_pixmap(items, spread, dpi=args.dpi, pool=pool)), args.repeat)
+            print(f"{name:>6} {old:7.1f}ms {new:7.1f}ms")
+
+if __name__ == "__main__":
+    main()
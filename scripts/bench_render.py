@@ -0,0 +1,78 @@
+"""ラスタライズ/生成のベンチマーク（用紙サイズ混在）
+
+    python scripts/bench_render.py [--pages 4] [--dpi 220] > bench_output.txt
+
+A6〜A1 のベクターページを合成し、
+- ページ単体: 従来（ページ原寸×dpi）とスロット基準（配置先で dpi）の描画時間・画素数
+- generate_pdf 全体: 所要時間と出力サイズ
+を表示する。
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import fitz  # noqa: E402
+from app.core.engine import A4_LANDSCAPE_H_PT, A4_LANDSCAPE_W_PT, generate_pdf  # noqa: E402
+from app.core.render import render_page_to_pil  # noqa: E402
+from app.core.types import Item, Options, PageRef  # noqa: E402
+
+# 縦向き (w, h) in points
+PAPER_SIZES = {
+    "A6": (298, 420),
+    "A4": (595, 842),
+    "A3": (842, 1191),
+    "A1": (1684, 2384),
+}
+
+def make_pdf(path: str, size: tuple[int, int], pages: int) -> None:
+    w, h = size
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page(width=w, height=h)
+        step = max(4, w // 60)
+        for x in range(0, w, step):
+            page.draw_line((x, 0), (w - x, h), color=(0, 0, 0.6), width=0.5)
+        page.insert_text((36, 72), f"page {p + 1}", fontsize=min(w, h) / 12)
+    doc.save(path)
+    doc.close()
+
+def bench_pages(items: list[Item], dpi: int) -> None:
+    box = (round(A4_LANDSCAPE_W_PT / 2 * dpi / 72), round(A4_LANDSCAPE_H_PT * dpi / 72))
+    print(f"# ページ単体 dpi={dpi} slot={box[0]}x{box[1]}px")
+    print(f"{'size':>4} {'mode':>6} {'ms':>8} {'pixels':>10}")
+    for idx, it in enumerate(items):
+        pref = PageRef(item_index=idx, pdf_page_index=0)
+        for mode, fb in (("page", None), ("slot", box)):
+            t0 = time.perf_counter()
+            im = render_page_to_pil(items, pref, dpi=dpi, grayscale=False, fit_box=fb)
+            ms = (time.perf_counter() - t0) * 1000
+            print(f"{it.display_name:>4} {mode:>6} {ms:8.1f} {im.width * im.height:10d}")
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=4, help="用紙サイズごとのページ数")
+    ap.add_argument("--dpi", type=int, default=Options.dpi_normal)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        items = []
+        for name, size in PAPER_SIZES.items():
+            path = os.path.join(td, f"{name}.pdf")
+            make_pdf(path, size, args.pages)
+            items.append(Item(kind="pdf", path=path, display_name=name))
+
+        bench_pages(items, args.dpi)
+
+        out = os.path.join(td, "out.pdf")
+        t0 = time.perf_counter()
+        generate_pdf(items, Options(mode="booklet", dpi_normal=args.dpi), out)
+        sec = time.perf_counter() - t0
+        print(f"# generate_pdf: {len(items) * args.pages} ページ {sec:.2f}s 出力 {os.path.getsize(out) / 1e6:.1f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,40 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # プロジェクトルート（tests の1つ上）を import パスに追加
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+import fitz  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from app.core.types import Item  # noqa: E402
+
+COLORS = ["red", "green", "blue", "yellow", "black"]
+
+@pytest.fixture
+def png_items(tmp_path):
+    """色ごとに1枚ずつ単色 PNG を作り、画像 Item のリストを返す関数"""
+    def make(colors=COLORS, size=(120, 160)) -> list[Item]:
+        items = []
+        for k, color in enumerate(colors):
+            p = tmp_path / f"{k:03d}.png"
+            Image.new("RGB", size, color).save(p)
+            items.append(Item(kind="image", path=str(p), display_name=p.name))
+        return items
+    return make
+
+@pytest.fixture
+def spread_centers():
+    """出力 PDF の各ページについて、左右それぞれの中央の色を返す関数"""
+    def centers(path) -> list:
+        with fitz.open(path) as doc:
+            res = []
+            for page in doc:
+                pix = page.get_pixmap(dpi=10)
+                res.append((pix.pixel(pix.width // 4, pix.height // 2), pix.pixel(pix.width * 3 // 4, pix.height // 2)))
+            return res
+    return centers
@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.aio import AsyncJobRunner
+from app.core.engine import load_manifest
+from app.core.errors import UserFacingError
+from app.core.types import Options
+
+def test_events_stream_progress_and_metrics(tmp_path, png_items):
+    items = png_items(["white"] * 4)
+    out = tmp_path / "out.pdf"
+
+    async def collect():
+        return [ev async for ev in AsyncJobRunner().events(items, Options(dpi_normal=30), str(out))]
+
+    events = asyncio.run(collect())
+    progress = [(e.current, e.total) for e in events if e.kind == "progress"]
+    assert progress[-1] == (2, 2)
+    assert events[-1].kind == "metric"
+    assert "elapsed_s" in events[-1].metrics
+    assert out.is_file()
+
+def test_task_cancel_stops_job(tmp_path, png_items):
+    items = png_items(["white"] * 40)
+    out = tmp_path / "out.pdf"
+
+    async def main():
+        async def consume():
+            async for ev in AsyncJobRunner().events(items, Options(dpi_normal=30), str(out)):
+                if ev.kind == "progress":
+                    task.cancel()
+        task = asyncio.create_task(consume())
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert not out.exists()
+
+def test_manifest_with_several_outputs_writes_all(tmp_path, png_items):
+    items = png_items(["white"] * 2)
+    x, y = tmp_path / "x.pdf", tmp_path / "y.pdf"
+    manifest = tmp_path / "m.json"
+    manifest.write_text(json.dumps({
+        "items": [{"kind": "image", "path": it.path} for it in items],
+        "options": {"dpi_normal": 30},
+        "outputs": [{"output_pdf": str(x)}, {"output_pdf": str(y), "options": {"mode": "two_up"}}],
+    }), encoding="utf-8")
+
+    async def collect():
+        return [ev async for ev in AsyncJobRunner().events_from_manifest(str(manifest))]
+
+    assert asyncio.run(collect())[-1].kind == "metric"
+    assert x.is_file() and y.is_file()
+    with pytest.raises(UserFacingError):
+        load_manifest(str(manifest))
@@ -0,0 +1,67 @@
+import os
+
+import fitz
+
+from app.core.docpool import DocumentPool
+from app.core.engine import generate_pdf
+from app.core.types import Item, Options
+
+def _make_pdf(path, pages: int = 1):
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+def test_hits_and_lru_eviction(tmp_path):
+    a, b, c = (_make_pdf(tmp_path / f"{n}.pdf") for n in "abc")
+    pool = DocumentPool(max_open=2)
+    with pool.borrow(a):
+        pass
+    with pool.borrow(a):
+        pass
+    with pool.borrow(b):
+        pass
+    with pool.borrow(c):
+        pass
+    st = pool.stats()
+    assert (st.hits, st.misses, st.evictions, st.open) == (1, 3, 1, 2)
+    pool.close()
+    assert pool.stats().open == 0
+
+def test_referenced_doc_is_not_evicted(tmp_path):
+    a, b = (_make_pdf(tmp_path / f"{n}.pdf") for n in "ab")
+    pool = DocumentPool(max_open=1)
+    doc_a = pool.acquire(a)
+    with pool.borrow(b):
+        assert doc_a.page_count == 1
+    pool.release(a, doc_a)
+    assert pool.stats().open == 1
+    pool.close()
+
+def test_reopen_when_mtime_changes(tmp_path):
+    a = _make_pdf(tmp_path / "a.pdf")
+    pool = DocumentPool()
+    with pool.borrow(a) as doc:
+        assert doc.page_count == 1
+    _make_pdf(tmp_path / "a.pdf", pages=3)
+    st = os.stat(a)
+    os.utime(a, (st.st_atime, st.st_mtime + 10))
+    with pool.borrow(a) as doc:
+        assert doc.page_count == 3
+    assert pool.stats().invalidations == 1
+    pool.close()
+
+def test_pool_stats_in_log_are_per_job(tmp_path):
+    items = [Item(kind="pdf", path=_make_pdf(tmp_path / "a.pdf", pages=2), display_name="a.pdf")]
+    pool = DocumentPool()
+    lines = []
+    for k in range(3):
+        logs = []
+        generate_pdf(items, Options(dpi_normal=30), str(tmp_path / f"out{k}.pdf"), log_cb=logs.append, pool=pool)
+        lines.append(next(m for m in logs if m.startswith("文書プール")))
+    # 2回目以降は開き直さず、数字も累計ではなくそのジョブの分だけ
+    assert "miss=1" in lines[0]
+    assert "miss=0" in lines[1]
+    assert lines[1] == lines[2]
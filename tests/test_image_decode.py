@@ -0,0 +1,22 @@
+from PIL import Image
+
+from app.core.render import _open_image
+
+def test_jpeg_draft_decodes_near_target_size(tmp_path):
+    p = tmp_path / "big.jpg"
+    Image.new("RGB", (2400, 1600), "red").save(p, quality=90)
+    im = _open_image(str(p), (300, 300), grayscale=False)
+    assert im.mode == "RGB"
+    assert 300 <= im.width < 2400 // 2
+    assert im.height >= 200
+
+def test_png_reduce_and_exif_rotation(tmp_path):
+    p = tmp_path / "big.png"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # 90°回転
+    Image.new("RGB", (1600, 800), "blue").save(p, exif=exif)
+    im = _open_image(str(p), (200, 400), grayscale=False)
+    # 回転後は縦長、枠(200x400)にフィットする大きさ以上
+    assert im.width < im.height
+    assert im.width >= 200 and im.height >= 400
+    assert im.height < 1600
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtGui import QImage  # noqa: E402
+
+from app.core.types import Item  # noqa: E402
+from app.gui.itemmodel import ItemListModel  # noqa: E402
+
+def _model(n: int) -> ItemListModel:
+    m = ItemListModel()
+    m.insert_items(0, [Item(kind="image", path=f"{i}.png", display_name=str(i)) for i in range(n)])
+    return m
+
+def _names(m: ItemListModel) -> list[str]:
+    return [it.display_name for it in m.items()]
+
+def test_move_rows_batched_up_and_down():
+    m = _model(6)
+    assert m.move_rows([0, 1, 3, 4], -1) == [0, 1, 2, 3]
+    assert _names(m) == ["0", "1", "3", "4", "2", "5"]
+    assert m.move_rows([2, 3, 5], +1) == [3, 4, 5]
+    assert _names(m) == ["0", "1", "2", "3", "4", "5"]
+
+def test_remove_scattered_rows():
+    m = _model(6)
+    m.remove_rows([5, 0, 2, 3])
+    assert _names(m) == ["1", "4"]
+    assert m.rowCount() == 2
+
+def test_remove_rows_drops_cached_thumbnails():
+    m = _model(3)
+    m.insert_items(3, [Item(kind="image", path="0.png", display_name="0 again")])
+    for i in range(3):
+        m._on_loaded(f"{i}.png", QImage(), f"tip {i}")
+    m.remove_rows([0, 1])
+    # 0.png は後ろの行でまだ使われているので残す
+    assert sorted(m._tips) == ["0.png", "2.png"]
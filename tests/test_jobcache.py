@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+import app.core.engine as engine
+from app.core.jobcache import JobCache, job_cache_key
+from app.core.types import Options
+
+def test_key_tracks_options_and_input_mtime(tmp_path, png_items):
+    items = png_items(["white"])
+    p = items[0].path
+    k1 = job_cache_key(items, Options())
+    assert k1 == job_cache_key(items, Options())
+    assert k1 != job_cache_key(items, Options(grayscale=True))
+    st = os.stat(p)
+    os.utime(p, (st.st_atime, st.st_mtime + 5))
+    assert k1 != job_cache_key(items, Options())
+
+def test_eviction_keeps_total_under_cap(tmp_path):
+    cache = JobCache(str(tmp_path / "c"), max_bytes=250)
+    for i, k in enumerate("abc"):
+        cache.store_bytes(k, b"x" * 100)
+        os.utime(cache._entry(k), (i, i))
+    assert sorted(os.listdir(tmp_path / "c")) == ["b.pdf", "c.pdf"]
+    assert cache.clear() == 2
+
+def test_manifest_hit_skips_generation(tmp_path, monkeypatch, png_items):
+    manifest = tmp_path / "m.json"
+    out = tmp_path / "out.pdf"
+    manifest.write_text(json.dumps({
+        "items": [{"kind": "image", "path": png_items(["white"])[0].path}],
+        "options": {"mode": "two_up"},
+        "output_pdf": str(out),
+    }), encoding="utf-8")
+    cache = JobCache(str(tmp_path / "c"))
+
+    assert engine.run_job_from_manifest(str(manifest), cache=cache) is False
+    first = out.read_bytes()
+    out.unlink()
+
+    def boom(*a, **k):
+        raise AssertionError("should be served from cache")
+    monkeypatch.setattr(engine, "generate_pdf", boom)
+    assert engine.run_job_from_manifest(str(manifest), cache=cache) is True
+    assert out.read_bytes() == first
+
+def test_cache_errors_do_not_fail_the_job(tmp_path, png_items):
+    manifest = tmp_path / "m.json"
+    out = tmp_path / "out.pdf"
+    manifest.write_text(json.dumps({
+        "items": [{"kind": "image", "path": png_items(["white"])[0].path}],
+        "output_pdf": str(out),
+    }), encoding="utf-8")
+    (tmp_path / "notadir").write_bytes(b"")
+    cache = JobCache(str(tmp_path / "notadir" / "c"))
+
+    logs = []
+    assert engine.run_job_from_manifest(str(manifest), cache=cache, log_cb=logs.append) is False
+    assert out.read_bytes().startswith(b"%PDF")
+    assert logs and "キャッシュ" in logs[0]
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX の権限ビット")
+def test_cache_hit_output_has_normal_file_mode(tmp_path, png_items):
+    manifest = tmp_path / "m.json"
+    out = tmp_path / "out.pdf"
+    manifest.write_text(json.dumps({
+        "items": [{"kind": "image", "path": png_items(["white"])[0].path}],
+        "output_pdf": str(out),
+    }), encoding="utf-8")
+    cache = JobCache(str(tmp_path / "c"))
+
+    engine.run_job_from_manifest(str(manifest), cache=cache)
+    fresh = out.stat().st_mode & 0o777
+    out.unlink()
+    assert engine.run_job_from_manifest(str(manifest), cache=cache) is True
+    assert out.stat().st_mode & 0o777 == fresh
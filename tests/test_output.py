@@ -0,0 +1,27 @@
+import io
+
+import fitz
+from PIL import Image
+
+from app.core.engine import generate_pdf
+from app.core.types import Item, Options
+
+def test_generate_pdf_to_stream(png_items):
+    buf = io.BytesIO()
+    generate_pdf(png_items(["white"]), Options(dpi_normal=30), buf)
+    assert buf.getvalue().startswith(b"%PDF")
+
+def test_generate_pdf_to_path_leaves_no_tmp(tmp_path, png_items):
+    out = tmp_path / "sub" / "out.pdf"
+    generate_pdf(png_items(["white"]), Options(dpi_normal=30), str(out))
+    assert out.read_bytes().startswith(b"%PDF")
+    assert [p.name for p in out.parent.iterdir()] == ["out.pdf"]
+
+def test_image_items_are_embedded_at_source_resolution(tmp_path):
+    p = tmp_path / "big.jpg"
+    Image.new("RGB", (2400, 1600), "red").save(p, quality=90)
+    out = tmp_path / "out.pdf"
+    generate_pdf([Item(kind="image", path=str(p), display_name=p.name)], Options(dpi_normal=30), str(out))
+    with fitz.open(out) as doc:
+        widths = [info["width"] for page in doc for info in page.get_image_info()]
+    assert widths == [2400]
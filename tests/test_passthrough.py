@@ -0,0 +1,49 @@
+import io
+
+import fitz
+from PIL import Image
+
+from app.core.engine import generate_pdf
+from app.core.render import is_single_image_page
+from app.core.types import Item, Options
+
+def _jpeg_bytes() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (300, 420), "gray").save(buf, format="JPEG", quality=70)
+    return buf.getvalue()
+
+def _make_scan_pdf(path, with_text: bool = False) -> bytes:
+    jpg = _jpeg_bytes()
+    doc = fitz.open()
+    page = doc.new_page(width=300, height=420)
+    page.insert_image(page.rect, stream=jpg)
+    if with_text:
+        page.insert_text((20, 40), "hello")
+    doc.save(str(path))
+    doc.close()
+    return jpg
+
+def test_is_single_image_page(tmp_path):
+    scan = tmp_path / "scan.pdf"
+    mixed = tmp_path / "mixed.pdf"
+    _make_scan_pdf(scan)
+    _make_scan_pdf(mixed, with_text=True)
+    with fitz.open(str(scan)) as d:
+        assert is_single_image_page(d.load_page(0))
+    with fitz.open(str(mixed)) as d:
+        assert not is_single_image_page(d.load_page(0))
+    with fitz.open(str(scan)) as d:
+        page = d.load_page(0)
+        page.draw_line((0, 0), (100, 100))  # 画像＋ベクター（図面上のロゴ等）
+        assert not is_single_image_page(page)
+
+def test_generate_pdf_transplants_scan_stream(tmp_path):
+    scan = tmp_path / "scan.pdf"
+    jpg = _make_scan_pdf(scan)
+    out = tmp_path / "out.pdf"
+    items = [Item(kind="pdf", path=str(scan), display_name="scan.pdf")]
+    generate_pdf(items, Options(mode="two_up", cover_preview=False), str(out))
+
+    with fitz.open(str(out)) as d:
+        streams = [d.xref_stream_raw(x) for x in range(1, d.xref_length()) if d.xref_get_key(x, "Subtype")[1] == "/Image"]
+    assert jpg in streams
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from app.core.engine import generate_pdf
+from app.core.pipeline import OrderedPipeline, Stage
+from app.core.types import Options
+
+def _jitter(x):
+    # 先の要素ほど遅くして、後続が先に終わる状況を作る
+    time.sleep(0.002 * (10 - x % 10))
+    return x
+
+def test_results_come_back_in_input_order():
+    with OrderedPipeline([Stage("a", _jitter, 3), Stage("b", lambda x: x * 2, 2)], max_inflight=4) as p:
+        assert list(p.run(range(40))) == [x * 2 for x in range(40)]
+
+def test_error_is_raised_at_its_position():
+    def boom(x):
+        if x == 5:
+            raise ValueError("x=5")
+        return x
+
+    got = []
+    with OrderedPipeline([Stage("a", _jitter, 3), Stage("b", boom, 2)], max_inflight=4) as p:
+        with pytest.raises(ValueError, match="x=5"):
+            for x in p.run(range(20)):
+                got.append(x)
+    assert got == [0, 1, 2, 3, 4]
+
+def test_early_exit_does_not_hang_close():
+    release = threading.Event()
+
+    def slow(x):
+        if x == 3:
+            release.wait(1.0)  # 出口側が打ち切ったあとも処理中の要素
+        return x
+
+    p = OrderedPipeline([Stage("r", lambda x: x, 1), Stage("e", slow, 2)], max_inflight=8)
+    it = p.run(range(100))
+    assert next(it) == 0
+    t = threading.Thread(target=p.close)
+    t.start()
+    release.set()
+    t.join(5.0)
+    assert not t.is_alive()
+
+def test_generate_pdf_pipeline_matches_serial(tmp_path, png_items, spread_centers):
+    items = png_items()
+
+    def colors(opts: Options) -> list:
+        out = tmp_path / f"out_{opts.render_threads}_{opts.encode_threads}.pdf"
+        generate_pdf(items, opts, str(out))
+        return spread_centers(out)
+
+    serial = colors(Options(dpi_normal=30, render_threads=1, encode_threads=1, pipeline_depth=1))
+    parallel = colors(Options(dpi_normal=30, render_threads=2, encode_threads=2, pipeline_depth=4))
+    assert len(serial) == 4  # 5ページ＋空白3 → ブックレット 8面 = 4 スプレッド
+    assert parallel == serial
@@ -0,0 +1,58 @@
+import fitz
+from PIL import Image, ImageChops
+
+from app.core.render import render_spread_preview, render_spread_preview_pixmap
+from app.core.types import Item, PageRef, Spread
+
+def _pix_to_pil(pix) -> Image.Image:
+    mode = "L" if pix.n == 1 else "RGB"
+    return Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+
+def test_pixmap_preview_matches_pil_preview(tmp_path):
+    p = tmp_path / "a.pdf"
+    doc = fitz.open()
+    for _ in range(2):
+        page = doc.new_page(width=595, height=842)
+        page.draw_rect(fitz.Rect(50, 50, 300, 400), color=(1, 0, 0), fill=(0, 0, 1))
+    doc.save(p)
+    doc.close()
+    items = [Item(kind="pdf", path=str(p), display_name="a.pdf")]
+    spread = Spread(left=PageRef(0, 0), right=PageRef(0, 1))
+
+    for gray in (False, True):
+        ref = render_spread_preview(items, spread, dpi=40, grayscale=gray)
+        pix = render_spread_preview_pixmap(items, spread, dpi=40, grayscale=gray)
+        assert pix.n == (1 if gray else 3)
+        got = _pix_to_pil(pix)
+        assert got.size == ref.size
+        diff = ImageChops.difference(got.convert("L"), ref.convert("L")).getextrema()
+        assert diff[1] <= 8
+
+def test_pixmap_preview_places_image_and_blank(tmp_path):
+    p = tmp_path / "wide.png"
+    Image.new("RGB", (800, 200), "red").save(p)
+    items = [Item(kind="image", path=str(p), display_name="wide.png")]
+    spread = Spread(left=PageRef(0), right=None)
+    pix = render_spread_preview_pixmap(items, spread, dpi=30)
+    im = _pix_to_pil(pix)
+    w, h = im.size
+    # 左半分の中央は赤、右半分（空白）は白
+    assert im.getpixel((w // 4, h // 2))[0] > 200 and im.getpixel((w // 4, h // 2))[1] < 60
+    assert im.getpixel((w * 3 // 4, h // 2)) == (255, 255, 255)
+
+def test_pixmap_preview_applies_png_exif_rotation(tmp_path):
+    p = tmp_path / "rot.png"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # 90°回転
+    Image.new("RGB", (1600, 800), "blue").save(p, exif=exif)
+    items = [Item(kind="image", path=str(p), display_name="rot.png")]
+    spread = Spread(left=PageRef(0), right=None)
+
+    ref = render_spread_preview(items, spread, dpi=30)
+    got = _pix_to_pil(render_spread_preview_pixmap(items, spread, dpi=30))
+    # 回転後は縦長なので、左半分の左右の端は白、上下の中央は青
+    w, h = got.size
+    assert got.getpixel((2, h // 2)) == (255, 255, 255)
+    assert got.getpixel((w // 4, 2))[2] > 200
+    diff = ImageChops.difference(got.convert("L"), ref.convert("L")).getextrema()
+    assert diff[1] <= 8
@@ -0,0 +1,42 @@
+import fitz
+import pytest
+from PIL import ImageChops, ImageStat
+
+from app.core.errors import JobCanceled
+from app.core.render import RenderBudget, render_page_to_pil
+from app.core.types import Item, PageRef
+
+def _vector_pdf(path) -> list[Item]:
+    doc = fitz.open()
+    page = doc.new_page(width=200, height=300)
+    for i in range(50):
+        page.draw_line((0, i * 6), (200, 300 - i * 6))
+    doc.save(str(path))
+    doc.close()
+    return [Item(kind="pdf", path=str(path), display_name="v.pdf")]
+
+def test_tiled_render_matches_full_size(tmp_path):
+    items = _vector_pdf(tmp_path / "v.pdf")
+    pref = PageRef(item_index=0, pdf_page_index=0)
+    full = render_page_to_pil(items, pref, dpi=144, grayscale=False)
+    tiled = render_page_to_pil(items, pref, dpi=144, grayscale=False, budget=RenderBudget())
+    assert tiled.size == full.size
+    # 帯ごとのクリップ描画はアンチエイリアスが全面描画と少し違う（最大30階調程度）。
+    # 帯のずれ（線が1px動くと200階調超）や継ぎ目の抜け（255階調）は検出できる幅にする
+    diff = ImageChops.difference(tiled.convert("L"), full.convert("L"))
+    assert diff.getextrema()[1] <= 48
+    assert ImageStat.Stat(diff).mean[0] < 1.5
+
+def test_over_budget_falls_back_to_min_dpi(tmp_path):
+    items = _vector_pdf(tmp_path / "v.pdf")
+    logs = []
+    budget = RenderBudget(seconds=1e-9, min_dpi=36, log_cb=logs.append)
+    im = render_page_to_pil(items, PageRef(item_index=0, pdf_page_index=0), dpi=144, grayscale=False, budget=budget)
+    assert im.size == (100, 150)
+    assert len(logs) == 2  # 144 → 72 → 36
+
+def test_cancel_during_render(tmp_path):
+    items = _vector_pdf(tmp_path / "v.pdf")
+    budget = RenderBudget(cancel_cb=lambda: True)
+    with pytest.raises(JobCanceled):
+        render_page_to_pil(items, PageRef(item_index=0, pdf_page_index=0), dpi=72, grayscale=False, budget=budget)
@@ -0,0 +1,52 @@
+import json
+
+import fitz
+
+import app.core.engine as engine
+from app.core.jobcache import JobCache
+from app.core.types import Options, OutputVariant
+
+def test_variants_match_separate_runs_and_render_once(tmp_path, monkeypatch, png_items, spread_centers):
+    items = png_items()
+    opts = [
+        Options(mode="booklet", dpi_normal=30),
+        Options(mode="two_up", dpi_normal=30),
+        Options(mode="two_up", dpi_normal=30, grayscale=True),
+    ]
+    for k, o in enumerate(opts):
+        engine.generate_pdf(items, o, str(tmp_path / f"single{k}.pdf"))
+
+    calls = []
+    real = engine.render_page_to_pil
+    monkeypatch.setattr(engine, "render_page_to_pil", lambda *a, **kw: calls.append(kw["dpi"]) or real(*a, **kw))
+    engine.generate_pdfs(items, [OutputVariant(o, str(tmp_path / f"multi{k}.pdf")) for k, o in enumerate(opts)])
+
+    # 3出力とも dpi 30 なので、入力5ページを1回ずつしか描かない
+    assert calls == [30] * len(items)
+    for k in range(len(opts)):
+        assert spread_centers(tmp_path / f"multi{k}.pdf") == spread_centers(tmp_path / f"single{k}.pdf")
+
+def test_manifest_outputs_and_cache(tmp_path, png_items):
+    items = png_items()
+    manifest = tmp_path / "m.json"
+    a, b = tmp_path / "booklet.pdf", tmp_path / "proof.pdf"
+    manifest.write_text(json.dumps({
+        "items": [{"kind": "image", "path": it.path} for it in items],
+        "options": {"mode": "booklet"},
+        "outputs": [
+            {"output_pdf": str(a)},
+            {"output_pdf": str(b), "options": {"mode": "two_up", "compress": True}},
+        ],
+    }), encoding="utf-8")
+
+    _, variants = engine.load_manifest_outputs(str(manifest))
+    assert [(v.options.mode, v.options.compress) for v in variants] == [("booklet", False), ("two_up", True)]
+
+    cache = JobCache(str(tmp_path / "c"))
+    assert engine.run_job_from_manifest(str(manifest), cache=cache) is False
+    with fitz.open(a) as da, fitz.open(b) as db:
+        assert (da.page_count, db.page_count) == (4, 3)
+    a.unlink()
+    b.unlink()
+    assert engine.run_job_from_manifest(str(manifest), cache=cache) is True
+    assert a.exists() and b.exists()